@@ -47,10 +47,14 @@ a = Analysis(
         'PIL',
         'PIL.Image',
         'PIL.ImageTk',
+        'turbojpeg',
+
+        # 配置文件
+        'orjson',
 
         # 日志
-        'loguru',
-        'loguru._logger',
+        'logging',
+        'logging.handlers',
 
         # 异步
         'asyncio',
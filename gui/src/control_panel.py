@@ -13,8 +13,8 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
 from typing import Callable, Optional, Tuple
-from loguru import logger
 
+from logger import logger
 from protocol_builder import (
     build_capture, build_record_start, build_record_stop,
     build_preview_start, build_preview_stop,
@@ -796,8 +796,8 @@ class ControlPanel(ttk.Frame):
 if __name__ == '__main__':
     #测试代码
     import sys
-    logger.remove()
-    logger.add(sys.stdout, level="DEBUG")
+    import logging
+    logging.basicConfig(level=logging.DEBUG, stream=sys.stdout)
 
     def mock_send(data: bytes) -> bool:
         print(f"发送数据: {data.hex().upper()}")
@@ -5,6 +5,9 @@
 定义客户端返回的错误码及其中文描述
 """
 
+#成功码
+SUCCESS = 0x0000
+
 #错误码定义
 ERROR_CODES = {
     #成功
@@ -45,6 +48,19 @@ ERROR_CODES = {
     0xFFFF: "未知错误",
 }
 
+#已知错误码的十六进制文本（预先格式化）
+ERROR_HEX = {c: f"0x{c:04X}" for c in ERROR_CODES}
+
+#错误类别表（按错误码高字节索引）
+_CATEGORY_TABLE = ["未知类别"] * 256
+_CATEGORY_TABLE[0x00] = "成功"
+_CATEGORY_TABLE[0x01] = "相机错误"
+_CATEGORY_TABLE[0x02] = "存储错误"
+_CATEGORY_TABLE[0x03] = "状态冲突"
+_CATEGORY_TABLE[0x04] = "协议错误"
+_CATEGORY_TABLE[0x05] = "编码错误"
+_CATEGORY_TABLE[0xFF] = "未知错误"
+
 
 def get_error_message(code: int) -> str:
     """
@@ -69,17 +85,7 @@ def get_error_category(code: int) -> str:
     Returns:
         类别名称
     """
-    category = (code >> 8) & 0xFF
-    categories = {
-        0x00: "成功",
-        0x01: "相机错误",
-        0x02: "存储错误",
-        0x03: "状态冲突",
-        0x04: "协议错误",
-        0x05: "编码错误",
-        0xFF: "未知错误",
-    }
-    return categories.get(category, "未知类别")
+    return _CATEGORY_TABLE[(code >> 8) & 0xFF]
 
 
 def is_success(code: int) -> bool:
@@ -92,7 +98,7 @@ def is_success(code: int) -> bool:
     Returns:
         True表示成功，False表示失败
     """
-    return code == 0x0000
+    return code == SUCCESS
 
 
 if __name__ == '__main__':
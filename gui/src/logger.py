@@ -1,12 +1,16 @@
 """
 上位机日志模块
-使用loguru实现分级日志、文件滚动、彩色控制台输出
+使用标准库logging实现分级日志、文件滚动、控制台输出
+日志记录通过QueueHandler入队，由QueueListener后台线程写入各输出端
 """
 import sys
-import os
+import atexit
+import logging
+import logging.handlers
+import queue
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
-from loguru import logger
 
 
 #默认日志目录
@@ -15,80 +19,122 @@ DEFAULT_LOG_DIR = "./logs"
 DEFAULT_LOG_LEVEL = "INFO"
 #默认控制台日志级别
 DEFAULT_CONSOLE_LEVEL = "INFO"
-#默认单文件最大大小
-DEFAULT_ROTATION = "10 MB"
+#默认单文件最大大小（字节）
+DEFAULT_MAX_BYTES = 10 * 1024 * 1024
 #默认保留文件数
-DEFAULT_RETENTION = 10
+DEFAULT_BACKUP_COUNT = 10
+#默认应用名称
+DEFAULT_APP_NAME = "gui"
+
+#日志格式
+LOG_FORMAT = "%(asctime)s.%(msecs)03d | %(levelname)-8s | %(module)s:%(funcName)s:%(lineno)d - %(message)s"
+DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+#应用logger实例
+logger = logging.getLogger(DEFAULT_APP_NAME)
+
+#后台写日志监听器
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+def _stop_listener():
+    """停止后台写日志线程（刷新队列中剩余日志）"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
 
 
 def setup_logger(
     log_dir: str = DEFAULT_LOG_DIR,
     log_level: str = DEFAULT_LOG_LEVEL,
-    rotation: str = DEFAULT_ROTATION,
-    retention: int = DEFAULT_RETENTION,
+    max_bytes: int = DEFAULT_MAX_BYTES,
+    backup_count: int = DEFAULT_BACKUP_COUNT,
     console_level: str = DEFAULT_CONSOLE_LEVEL,
-    app_name: str = "gui"
-) -> "logger":
+    app_name: str = DEFAULT_APP_NAME
+) -> logging.Logger:
     """
     配置日志系统
 
     Args:
         log_dir: 日志文件目录
         log_level: 文件日志级别（DEBUG/INFO/WARNING/ERROR）
-        rotation: 单文件最大大小（如"10 MB"）
-        retention: 保留文件数量
+        max_bytes: 单文件最大大小（字节）
+        backup_count: 保留文件数量
         console_level: 控制台日志级别
         app_name: 应用名称，用于日志文件前缀
 
     Returns:
         配置好的logger实例
     """
-    #移除默认处理器
-    logger.remove()
+    global _listener
+
+    #移除已有处理器
+    _stop_listener()
+    for handler in logger.handlers[:]:
+        logger.removeHandler(handler)
+        handler.close()
 
     #确保日志目录存在
     log_path = Path(log_dir)
     log_path.mkdir(parents=True, exist_ok=True)
 
-    #添加控制台输出（彩色）
-    logger.add(
-        sys.stderr,
-        level=console_level,
-        format="<green>{time:YYYY-MM-DD HH:mm:ss}</green> | "
-               "<level>{level: <8}</level> | "
-               "<cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - "
-               "<level>{message}</level>",
-        colorize=True
+    formatter = logging.Formatter(LOG_FORMAT, DATE_FORMAT)
+    file_level = logging.getLevelName(log_level.upper())
+    stream_level = logging.getLevelName(console_level.upper())
+
+    #控制台输出
+    console_handler = logging.StreamHandler(sys.stderr)
+    console_handler.setLevel(stream_level)
+    console_handler.setFormatter(formatter)
+
+    #文件输出（按大小滚动）
+    file_handler = logging.handlers.RotatingFileHandler(
+        log_path / f"{app_name}.log",
+        maxBytes=max_bytes,
+        backupCount=backup_count,
+        encoding="utf-8"
     )
-
-    #添加文件输出（按日期命名，自动滚动）
-    logger.add(
-        f"{log_dir}/{app_name}_{{time:YYYY-MM-DD}}.log",
-        level=log_level,
-        format="{time:YYYY-MM-DD HH:mm:ss.SSS} | {level: <8} | {name}:{function}:{line} - {message}",
-        rotation=rotation,
-        retention=retention,
-        encoding="utf-8",
-        enqueue=True  #线程安全
+    file_handler.setLevel(file_level)
+    file_handler.setFormatter(formatter)
+
+    #错误日志单独文件
+    error_handler = logging.handlers.RotatingFileHandler(
+        log_path / f"{app_name}_error.log",
+        maxBytes=max_bytes,
+        backupCount=backup_count,
+        encoding="utf-8"
     )
-
-    #添加错误日志单独文件
-    logger.add(
-        f"{log_dir}/{app_name}_error_{{time:YYYY-MM-DD}}.log",
-        level="ERROR",
-        format="{time:YYYY-MM-DD HH:mm:ss.SSS} | {level: <8} | {name}:{function}:{line} - {message}",
-        rotation=rotation,
-        retention=retention,
-        encoding="utf-8",
-        enqueue=True
+    error_handler.setLevel(logging.ERROR)
+    error_handler.setFormatter(formatter)
+
+    #调用线程只负责入队，格式化和写文件在监听线程中完成
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    _listener = logging.handlers.QueueListener(
+        log_queue, console_handler, file_handler, error_handler,
+        respect_handler_level=True
     )
+    _listener.start()
+
+    logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    logger.setLevel(min(file_level, stream_level))
+    logger.propagate = False
 
     logger.info(f"日志系统初始化完成 - 目录: {log_path.absolute()}, 级别: {log_level}")
 
     return logger
 
 
-def get_logger(module_name: Optional[str] = None) -> "logger":
+atexit.register(_stop_listener)
+
+
+@lru_cache(maxsize=128)
+def _child_logger(name: str) -> logging.Logger:
+    """获取子logger（按名称缓存，避免重复加锁查找）"""
+    return logger.getChild(name)
+
+
+def get_logger(module_name: Optional[str] = None) -> logging.Logger:
     """
     获取logger实例
 
@@ -98,9 +144,7 @@ def get_logger(module_name: Optional[str] = None) -> "logger":
     Returns:
         logger实例
     """
-    if module_name:
-        return logger.bind(name=module_name)
-    return logger
+    return _child_logger(module_name) if module_name else logger
 
 
 #模块级别的便捷函数
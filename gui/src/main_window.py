@@ -22,9 +22,10 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
 import threading
+from functools import lru_cache
 from typing import Optional
-from loguru import logger
 
+from logger import logger
 from tcp_client import TcpClient, ConnectionState
 from protocol_builder import (
     Command, parse_ack_success, parse_ack_failed,
@@ -65,9 +66,56 @@ ERROR_DESCRIPTIONS = {
 }
 
 
+#固定参数命令帧（预先构建，点击时直接发送）
+_FRAME_CAPTURE = build_capture()
+_FRAME_PREVIEW_START = build_preview_start(resolution_index=0, fps=10)
+_FRAME_PREVIEW_STOP = build_preview_stop()
+_FRAME_RECORD_START = build_record_start(duration=0, resolution_index=0, fps=5)
+_FRAME_RECORD_STOP = build_record_stop()
+_FRAME_QUERY_STATUS = build_query_status()
+_FRAME_QUERY_PARAMS = build_query_params()
+
+#连接状态显示表（状态 -> (文字, 颜色)）
+_STATE_TEXT = {
+    ConnectionState.DISCONNECTED: ("未连接", "gray"),
+    ConnectionState.CONNECTING: ("连接中...", "orange"),
+    ConnectionState.RECONNECTING: ("重连中...", "orange"),
+    ConnectionState.CONNECTED: ("已连接", "green"),
+}
+
+#连接处于活动状态（已连接/重连中）
+_ACTIVE_STATES = frozenset((ConnectionState.CONNECTED, ConnectionState.RECONNECTING))
+
+#预览帧命令码（每帧比较，缓存为模块常量）
+_C_PREV = Command.PREVIEW_FRAME
+
+
 def get_error_description(code: int) -> str:
     """获取错误码描述"""
-    return ERROR_DESCRIPTIONS.get(code, f"未知错误码: 0x{code:04X}")
+    msg = ERROR_DESCRIPTIONS.get(code)
+    return msg if msg else f"未知错误码: 0x{code:04X}"
+
+
+def _parse_len_prefixed_name(data: bytes) -> str:
+    """
+    解析长度前缀的文件名（0xB0/0xB1数据段）
+
+    Args:
+        data: [文件名长度(1字节)][文件名(UTF-8)]
+
+    Returns:
+        文件名，数据为空时返回空字符串
+    """
+    if not data:
+        return ""
+    n = data[0]
+    return str(memoryview(data)[1:1+n], 'utf-8', 'ignore') if n else ""
+
+
+@lru_cache(maxsize=128)
+def _format_failed(orig_cmd: int, error_code: int) -> str:
+    """格式化操作失败日志（缓存，重复错误不再重复拼接）"""
+    return f"操作失败: 命令0x{orig_cmd:02X}, {get_error_description(error_code)} (0x{error_code:04X})"
 
 
 class MainWindow:
@@ -87,6 +135,7 @@ class MainWindow:
         self.root.title("Basler 相机控制系统")
         self.root.geometry("1200x800")
         self.root.minsize(800, 600)
+        self._after = self.root.after  #缓存after方法（跨线程回调调度）
 
         #TCP客户端
         self.client = TcpClient()
@@ -100,6 +149,7 @@ class MainWindow:
 
         #状态变量
         self._connection_state = ConnectionState.DISCONNECTED
+        self._is_connected = False  #由状态回调维护，避免每次发送访问client属性
         self._last_error_code: Optional[int] = None
 
         #加载配置
@@ -109,6 +159,17 @@ class MainWindow:
         self._create_menu()
         self._create_ui()
 
+        #命令分发表（命令码 -> 处理方法）
+        self._cmd_dispatch = {
+            Command.ACK_SUCCESS: self._handle_ack_success,
+            Command.ACK_FAILED: self._handle_ack_failed,
+            Command.STATUS_REPORT: self._handle_status_report,
+            Command.PARAMS_REPORT: self._handle_params_report,
+            Command.CAPTURE_DONE: self._handle_capture_done,
+            Command.RECORD_DONE: self._handle_record_done,
+            Command.HEARTBEAT: self._handle_heartbeat,
+        }
+
         #应用配置到界面
         self._apply_settings()
 
@@ -135,16 +196,18 @@ class MainWindow:
     def _apply_settings(self):
         """应用配置到界面"""
         #连接设置
-        conn = self._settings.get("connection", {})
+        #配置已由SettingsDialog合并默认值，各字段必然存在
+        conn = self._settings.get("connection") or SettingsDialog.DEFAULT_SETTINGS["connection"]
         self.host_entry.delete(0, tk.END)
-        self.host_entry.insert(0, conn.get("host", "127.0.0.1"))
+        self.host_entry.insert(0, conn["host"])
         self.port_entry.delete(0, tk.END)
-        self.port_entry.insert(0, str(conn.get("port", 8899)))
+        self.port_entry.insert(0, str(conn["port"]))
 
         #更新自动重连设置
-        auto_reconnect = conn.get("auto_reconnect", True)
-        reconnect_interval = conn.get("reconnect_interval", 5)
-        self.client.set_reconnect(auto_reconnect, interval=float(reconnect_interval), max_attempts=10)
+        self.client.set_reconnect(conn["auto_reconnect"], interval=float(conn["reconnect_interval"]),
+                                  max_attempts=10)
+        #应用层心跳开关（下次连接生效）
+        self.client.set_heartbeat_enabled(conn["heartbeat"])
 
         logger.info("配置已应用到界面")
 
@@ -198,14 +261,12 @@ class MainWindow:
 
         #服务器地址
         ttk.Label(conn_frame, text="服务器地址:").pack(side=tk.LEFT, padx=(0, 5))
-        self.host_entry = ttk.Entry(conn_frame, width=15)
-        self.host_entry.insert(0, "127.0.0.1")
+        self.host_entry = ttk.Entry(conn_frame, width=15)  #内容由_apply_settings填充
         self.host_entry.pack(side=tk.LEFT, padx=(0, 10))
 
         #端口
         ttk.Label(conn_frame, text="端口:").pack(side=tk.LEFT, padx=(0, 5))
-        self.port_entry = ttk.Entry(conn_frame, width=6)
-        self.port_entry.insert(0, "8899")
+        self.port_entry = ttk.Entry(conn_frame, width=6)  #内容由_apply_settings填充
         self.port_entry.pack(side=tk.LEFT, padx=(0, 10))
 
         #连接按钮
@@ -224,7 +285,7 @@ class MainWindow:
         #状态指示灯
         self.status_indicator = tk.Canvas(conn_frame, width=16, height=16, highlightthickness=0)
         self.status_indicator.pack(side=tk.LEFT, padx=5)
-        self._update_status_indicator("gray")
+        self._indicator_id = self.status_indicator.create_oval(2, 2, 14, 14, fill="gray", outline="")
 
     def _create_control_panel(self, parent):
         """创建控制面板区域"""
@@ -244,6 +305,9 @@ class MainWindow:
         self.preview_widget = PreviewWidget(preview_frame)
         self.preview_widget.pack(fill=tk.BOTH, expand=True)
 
+        #缓存预览帧更新方法（每帧调用）
+        self._update_preview_frame = self.preview_widget.update_frame_from_protocol
+
     def _create_status_area(self, parent):
         """创建状态监控区域"""
         status_frame = ttk.LabelFrame(parent, text="状态监控", padding="5")
@@ -252,10 +316,17 @@ class MainWindow:
         self.status_monitor = StatusMonitor(status_frame)
         self.status_monitor.pack(fill=tk.BOTH, expand=True)
 
+        #日志级别 -> 记录方法
+        self._log_methods = {
+            "info": self.status_monitor.log_info,
+            "success": self.status_monitor.log_success,
+            "warning": self.status_monitor.log_warning,
+            "error": self.status_monitor.log_error,
+        }
+
     def _update_status_indicator(self, color: str):
         """更新状态指示灯"""
-        self.status_indicator.delete("all")
-        self.status_indicator.create_oval(2, 2, 14, 14, fill=color, outline="")
+        self.status_indicator.itemconfig(self._indicator_id, fill=color)
 
     def _log(self, message: str):
         """添加日志"""
@@ -266,54 +337,47 @@ class MainWindow:
 
     def _log_with_level(self, message: str, level: str):
         if hasattr(self, 'status_monitor'):
-            log_method = getattr(self.status_monitor, f"log_{level}", self.status_monitor.log_info)
-            log_method(message)
+            log_methods = self._log_methods
+            log_methods.get(level, log_methods["info"])(message)
         else:
             logger.info(message)
 
     def _update_ui_state(self):
         """根据连接状态更新UI"""
-        connected = self._connection_state == ConnectionState.CONNECTED
-        reconnecting = self._connection_state == ConnectionState.RECONNECTING
+        state = self._connection_state
+        connected = state == ConnectionState.CONNECTED
+        active = state in _ACTIVE_STATES  #已连接或重连中
 
         #连接按钮
-        self.connect_btn.config(state=tk.NORMAL if not connected and not reconnecting else tk.DISABLED)
-        self.disconnect_btn.config(state=tk.NORMAL if connected or reconnecting else tk.DISABLED)
-        self.host_entry.config(state=tk.NORMAL if not connected and not reconnecting else tk.DISABLED)
-        self.port_entry.config(state=tk.NORMAL if not connected and not reconnecting else tk.DISABLED)
+        self.connect_btn.config(state=tk.DISABLED if active else tk.NORMAL)
+        self.disconnect_btn.config(state=tk.NORMAL if active else tk.DISABLED)
+        self.host_entry.config(state=tk.DISABLED if active else tk.NORMAL)
+        self.port_entry.config(state=tk.DISABLED if active else tk.NORMAL)
 
         #控制按钮
         if hasattr(self, 'control_panel'):
             self.control_panel.set_enabled(connected)
 
         #状态显示
-        if self._connection_state == ConnectionState.DISCONNECTED:
-            self.status_label.config(text="未连接", foreground="gray")
-            self._update_status_indicator("gray")
-            if hasattr(self, 'status_monitor'):
-                self.status_monitor.reset()
-        elif self._connection_state == ConnectionState.CONNECTING:
-            self.status_label.config(text="连接中...", foreground="orange")
-            self._update_status_indicator("orange")
-        elif self._connection_state == ConnectionState.RECONNECTING:
-            self.status_label.config(text="重连中...", foreground="orange")
-            self._update_status_indicator("orange")
-        else:
-            self.status_label.config(text="已连接", foreground="green")
-            self._update_status_indicator("green")
+        text, color = _STATE_TEXT[state]
+        self.status_label.config(text=text, foreground=color)
+        self._update_status_indicator(color)
+        if state == ConnectionState.DISCONNECTED and hasattr(self, 'status_monitor'):
+            self.status_monitor.reset()
 
     def _on_connection_state_changed(self, state: int):
         """连接状态变化回调（在工作线程中调用）"""
         self._connection_state = state
+        self._is_connected = state == ConnectionState.CONNECTED
         #在主线程中更新UI
-        self.root.after(0, self._update_ui_state)
+        self._after(0, self._update_ui_state)
 
         if state == ConnectionState.CONNECTED:
-            self.root.after(0, lambda: self._log("已连接到服务器"))
+            self._after(0, self._log, "已连接到服务器")
         elif state == ConnectionState.DISCONNECTED:
-            self.root.after(0, lambda: self._log("已断开连接"))
+            self._after(0, self._log, "已断开连接")
         elif state == ConnectionState.RECONNECTING:
-            self.root.after(0, lambda: self._log("正在尝试重连..."))
+            self._after(0, self._log, "正在尝试重连...")
 
     def _on_reconnect_failed(self):
         """重连失败回调（在工作线程中调用）"""
@@ -323,85 +387,24 @@ class MainWindow:
                 "连接失败",
                 "无法连接到服务器，已达到最大重试次数。\n请检查服务器是否运行，然后手动重新连接。"
             )
-        self.root.after(0, show_reconnect_failed)
+        self._after(0, show_reconnect_failed)
 
     def _on_data_received(self, version: int, cmd: int, data: bytes):
         """数据接收回调（在工作线程中调用）"""
+        #预览帧直接交给预览组件（单槽队列只保留最新帧，由组件定时显示），不经过主线程
+        if cmd == _C_PREV:
+            self._handle_preview_frame(data)
+            return
+
         #在主线程中处理
-        self.root.after(0, lambda: self._handle_response(version, cmd, data))
+        self._after(0, self._handle_response, version, cmd, data)
 
     def _handle_response(self, version: int, cmd: int, data: bytes):
         """处理服务器响应"""
         try:
-            if cmd == Command.ACK_SUCCESS:
-                orig_cmd = parse_ack_success(data)
-                if orig_cmd is not None:
-                    self._log_with_level(f"操作成功: 命令0x{orig_cmd:02X}", "success")
-
-            elif cmd == Command.ACK_FAILED:
-                result = parse_ack_failed(data)
-                if result:
-                    orig_cmd, error_code = result
-                    self._last_error_code = error_code
-                    error_desc = get_error_description(error_code)
-                    self._log_with_level(
-                        f"操作失败: 命令0x{orig_cmd:02X}, {error_desc} (0x{error_code:04X})",
-                        "error"
-                    )
-
-            elif cmd == Command.STATUS_REPORT:
-                if len(data) > 0 and hasattr(self, 'status_monitor'):
-                    status_byte = data[0]
-                    status = self.status_monitor.parse_status_byte(status_byte)
-                    self.status_monitor.update_status(status)
-                    if hasattr(self, 'control_panel'):
-                        self.control_panel.set_recording_state(status.get('recording', False))
-                        self.control_panel.set_preview_state(status.get('previewing', False))
-                        self.control_panel.set_continuous_state(status.get('continuous', False))
-                        if not status.get('previewing', False) and hasattr(self, 'preview_widget'):
-                            self.preview_widget.clear()
-
-            elif cmd == Command.PARAMS_REPORT:
-                if hasattr(self, 'status_monitor'):
-                    params = self.status_monitor.parse_params(data)
-                    if params:
-                        self.status_monitor.update_params(params)
-                        if hasattr(self, 'control_panel'):
-                            self.control_panel.update_params(
-                                exposure_mode=params.get('exposure_mode', 0),
-                                exposure_value=params.get('exposure_value', 0),
-                                gain=params.get('gain', 0),
-                                wb_mode=params.get('wb_mode', 0),
-                                width=params.get('width'),
-                                height=params.get('height')
-                            )
-
-            elif cmd == Command.CAPTURE_DONE:
-                if len(data) > 0:
-                    filename_len = data[0]
-                    filename = data[1:1+filename_len].decode('utf-8', errors='ignore')
-                    if hasattr(self, 'control_panel'):
-                        self.control_panel.set_last_capture_file(filename)
-                    self._log_with_level(f"拍照完成: {filename}", "success")
-                else:
-                    self._log_with_level("拍照完成", "success")
-
-            elif cmd == Command.RECORD_DONE:
-                if len(data) > 0:
-                    filename_len = data[0]
-                    filename = data[1:1+filename_len].decode('utf-8', errors='ignore')
-                    self._log_with_level(f"录像完成: {filename}", "success")
-                else:
-                    self._log_with_level("录像完成", "success")
-
-            elif cmd == Command.PREVIEW_FRAME:
-                #预览帧处理
-                self._handle_preview_frame(data)
-
-            elif cmd == Command.HEARTBEAT:
-                #心跳响应
-                logger.debug("收到心跳响应")
-
+            handler = self._cmd_dispatch.get(cmd)
+            if handler is not None:
+                handler(data)
             else:
                 self._log(f"收到未知命令: 0x{cmd:02X}")
 
@@ -409,28 +412,91 @@ class MainWindow:
             logger.error(f"处理响应异常: {e}")
             self._log(f"处理响应异常: {e}")
 
+    def _handle_ack_success(self, data: bytes):
+        """处理操作成功应答（0x90）"""
+        orig_cmd = parse_ack_success(data)
+        if orig_cmd is not None:
+            self._log_with_level(f"操作成功: 命令0x{orig_cmd:02X}", "success")
+
+    def _handle_ack_failed(self, data: bytes):
+        """处理操作失败应答（0x91）"""
+        result = parse_ack_failed(data)
+        if result:
+            orig_cmd, error_code = result
+            self._last_error_code = error_code
+            self._log_with_level(_format_failed(orig_cmd, error_code), "error")
+
+    def _handle_status_report(self, data: bytes):
+        """处理状态上报（0xA0）"""
+        if len(data) > 0 and hasattr(self, 'status_monitor'):
+            status_byte = data[0]
+            status = self.status_monitor.parse_status_byte(status_byte)
+            self.status_monitor.update_status(status)
+            if hasattr(self, 'control_panel'):
+                self.control_panel.set_recording_state(status.get('recording', False))
+                self.control_panel.set_preview_state(status.get('previewing', False))
+                self.control_panel.set_continuous_state(status.get('continuous', False))
+                if not status.get('previewing', False) and hasattr(self, 'preview_widget'):
+                    self.preview_widget.clear()
+
+    def _handle_params_report(self, data: bytes):
+        """处理参数上报（0xA1）"""
+        if hasattr(self, 'status_monitor'):
+            params = self.status_monitor.parse_params(data)
+            if params:
+                self.status_monitor.update_params(params)
+                if hasattr(self, 'control_panel'):
+                    self.control_panel.update_params(
+                        exposure_mode=params.get('exposure_mode', 0),
+                        exposure_value=params.get('exposure_value', 0),
+                        gain=params.get('gain', 0),
+                        wb_mode=params.get('wb_mode', 0),
+                        width=params.get('width'),
+                        height=params.get('height')
+                    )
+
+    def _handle_capture_done(self, data: bytes):
+        """处理拍照完成通知（0xB0）"""
+        filename = _parse_len_prefixed_name(data)
+        if filename:
+            if hasattr(self, 'control_panel'):
+                self.control_panel.set_last_capture_file(filename)
+            self._log_with_level(f"拍照完成: {filename}", "success")
+        else:
+            self._log_with_level("拍照完成", "success")
+
+    def _handle_record_done(self, data: bytes):
+        """处理录像完成通知（0xB1）"""
+        filename = _parse_len_prefixed_name(data)
+        if filename:
+            self._log_with_level(f"录像完成: {filename}", "success")
+        else:
+            self._log_with_level("录像完成", "success")
+
+    def _handle_heartbeat(self, data: bytes):
+        """处理心跳响应（0xFF）"""
+        logger.debug("收到心跳响应")
+
     def _on_error(self, message: str):
         """错误回调（在工作线程中调用）"""
-        self.root.after(0, lambda: self._log_with_level(f"错误: {message}", "error"))
+        self._after(0, self._log_with_level, f"错误: {message}", "error")
 
     def _handle_preview_frame(self, data: bytes):
         """
-        处理预览帧数据
+        处理预览帧数据（在接收线程中调用，预览组件的入队操作是线程安全的）
 
         Args:
             data: 0xC0预览帧数据段
         """
         try:
-            if hasattr(self, 'preview_widget'):
-                success = self.preview_widget.update_frame_from_protocol(data)
-                if not success:
-                    logger.warning("预览帧处理失败")
+            if not self._update_preview_frame(data):
+                logger.warning("预览帧处理失败")
         except Exception as e:
             logger.error(f"预览帧处理异常: {e}")
 
     def _send_command(self, data: bytes) -> bool:
         """发送协议帧"""
-        if not self.client.is_connected:
+        if not self._is_connected:
             self._log_with_level("未连接服务器，无法发送命令", "warning")
             return False
         return self.client.send(data)
@@ -458,7 +524,7 @@ class MainWindow:
         def connect_task():
             success = self.client.connect(host, port, timeout=5.0)
             if not success:
-                self.root.after(0, lambda: self._log("连接失败"))
+                self._after(0, self._log, "连接失败")
 
         threading.Thread(target=connect_task, daemon=True).start()
 
@@ -470,19 +536,19 @@ class MainWindow:
     def _on_capture_click(self):
         """拍照按钮点击"""
         self._log("发送拍照命令...")
-        if not self.client.send(build_capture()):
+        if not self.client.send(_FRAME_CAPTURE):
             self._log("发送拍照命令失败")
 
     def _on_preview_start_click(self):
         """开启预览按钮点击"""
         self._log("发送开启预览命令...")
-        if not self.client.send(build_preview_start(resolution_index=0, fps=10)):
+        if not self.client.send(_FRAME_PREVIEW_START):
             self._log("发送开启预览命令失败")
 
     def _on_preview_stop_click(self):
         """停止预览按钮点击"""
         self._log("发送停止预览命令...")
-        if not self.client.send(build_preview_stop()):
+        if not self.client.send(_FRAME_PREVIEW_STOP):
             self._log("发送停止预览命令失败")
         #清除预览显示
         if hasattr(self, 'preview_widget'):
@@ -491,25 +557,25 @@ class MainWindow:
     def _on_record_start_click(self):
         """开始录像按钮点击"""
         self._log("发送开始录像命令...")
-        if not self.client.send(build_record_start(duration=0, resolution_index=0, fps=5)):
+        if not self.client.send(_FRAME_RECORD_START):
             self._log("发送开始录像命令失败")
 
     def _on_record_stop_click(self):
         """停止录像按钮点击"""
         self._log("发送停止录像命令...")
-        if not self.client.send(build_record_stop()):
+        if not self.client.send(_FRAME_RECORD_STOP):
             self._log("发送停止录像命令失败")
 
     def _on_query_status_click(self):
         """查询状态按钮点击"""
         self._log("发送查询状态命令...")
-        if not self.client.send(build_query_status()):
+        if not self.client.send(_FRAME_QUERY_STATUS):
             self._log("发送查询状态命令失败")
 
     def _on_query_params_click(self):
         """查询参数按钮点击"""
         self._log("发送查询参数命令...")
-        if not self.client.send(build_query_params()):
+        if not self.client.send(_FRAME_QUERY_PARAMS):
             self._log("发送查询参数命令失败")
 
     def _on_close(self):
@@ -527,8 +593,8 @@ class MainWindow:
 if __name__ == '__main__':
     #测试代码
     import sys
-    logger.remove()
-    logger.add(sys.stdout, level="DEBUG")
+    import logging
+    logging.basicConfig(level=logging.DEBUG, stream=sys.stdout)
 
     window = MainWindow()
     window.run()
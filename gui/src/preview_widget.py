@@ -8,6 +8,7 @@
 - 帧率统计
 - 自动丢弃过时帧（仅显示最新帧）
 - 帧序号检查
+- 解码在后台线程进行，主线程定时取最新图像显示（单槽队列，自动丢弃积压帧）
 
 0xC0预览帧数据格式:
 数据段: [序号(4字节大端)][JPEG长度(4字节大端)][JPEG数据]
@@ -19,8 +20,12 @@ import struct
 import time
 import io
 import threading
+import queue
+import logging
+from collections import deque
 from typing import Optional, Tuple
-from loguru import logger
+
+from logger import logger
 
 try:
     from PIL import Image, ImageTk
@@ -28,14 +33,109 @@ except ImportError:
     logger.error("缺少Pillow库，请执行: pip install Pillow")
     raise
 
+try:
+    from turbojpeg import TurboJPEG, TJPF_RGB
+    TURBOJPEG_AVAILABLE = True
+except ImportError:
+    TURBOJPEG_AVAILABLE = False
+    logger.info("PyTurboJPEG未安装，使用Pillow解码JPEG")
+
+
+#TurboJPEG解码器实例（延迟创建，解码线程安全）
+_tj: Optional["TurboJPEG"] = None
+
+
+def _get_turbojpeg() -> Optional["TurboJPEG"]:
+    """
+    获取TurboJPEG解码器
+
+    Returns:
+        TurboJPEG实例，不可用（未安装或找不到libturbojpeg）时返回None
+    """
+    global _tj, TURBOJPEG_AVAILABLE
+    if _tj is None and TURBOJPEG_AVAILABLE:
+        try:
+            _tj = TurboJPEG()
+        except Exception as e:
+            TURBOJPEG_AVAILABLE = False
+            logger.warning(f"libturbojpeg加载失败，使用Pillow解码JPEG: {e}")
+    return _tj
+
+
+#预览帧数据头: 序号+JPEG长度（大端）
+_SEQ_LEN = struct.Struct('>II')
+
+#libjpeg-turbo支持的IDCT缩放因子（解码时直接缩小）
+_SCALING_FACTORS = ((1, 8), (1, 4), (1, 2))
+
+
+def _pick_scaling_factor(scale: float, supported=None) -> Optional[Tuple[int, int]]:
+    """
+    选择解码缩放因子
+
+    Args:
+        scale: 目标缩放比例（显示尺寸/原始尺寸）
+        supported: 解码器支持的缩放因子集合，为None时不检查
+
+    Returns:
+        不小于目标比例的最小缩放因子(分子, 分母)，无需缩小时返回None
+    """
+    for factor in _SCALING_FACTORS:
+        if factor[0] / factor[1] >= scale and (supported is None or factor in supported):
+            return factor
+    return None
+
+
+def _put_latest(q: queue.Queue, item) -> bool:
+    """
+    放入单槽队列，队列已满时用新数据替换旧数据
+
+    Returns:
+        True表示替换掉了一个旧数据
+    """
+    replaced = False
+    try:
+        q.put_nowait(item)
+    except queue.Full:
+        try:
+            q.get_nowait()
+            replaced = True
+        except queue.Empty:
+            pass
+        try:
+            q.put_nowait(item)
+        except queue.Full:
+            pass
+    return replaced
+
+
+def _drain(q: queue.Queue):
+    """清空队列"""
+    try:
+        while True:
+            q.get_nowait()
+    except queue.Empty:
+        pass
+
 
 class PreviewWidget(tk.Frame):
     """
     预览显示组件
 
     用于显示实时预览图像，支持JPEG解码、自动缩放、帧率统计
+
+    流水线: update_frame(调用线程) -> _jpeg_q -> 解码线程组 -> _img_q -> 主线程定时显示
+    两级队列均只保留最新一项，积压时丢弃旧帧，不会阻塞调用线程
+    多个解码线程可能乱序完成，晚于已解码帧的结果直接丢弃
     """
 
+    #显示队列轮询间隔（毫秒）
+    DISPLAY_POLL_MS = 16
+    #统计标签刷新间隔（毫秒），与帧率解耦
+    LABEL_UPDATE_MS = 200
+    #解码线程数（libjpeg-turbo/PIL解码时释放GIL，可并行解码相邻帧）
+    DECODE_WORKERS = 2
+
     def __init__(self, parent, **kwargs):
         """
         初始化预览组件
@@ -48,33 +148,55 @@ class PreviewWidget(tk.Frame):
 
         #帧管理
         self._last_frame_seq = -1  #上一帧序号
+        self._last_decoded_seq = -1  #最近解码完成的帧序号
         self._frame_count = 0      #接收帧数
         self._display_count = 0    #显示帧数
         self._dropped_count = 0    #丢弃帧数
 
         #帧率统计
         self._fps = 0.0
-        self._fps_timestamps = []  #最近帧的时间戳列表
+        self._fps_timestamps = deque(maxlen=512)  #最近帧的时间戳（单调时钟）
         self._fps_window = 1.0     #帧率计算窗口（秒）
 
         #图像缓存
         self._current_image: Optional[ImageTk.PhotoImage] = None
         self._image_size: Tuple[int, int] = (0, 0)  #原始图像尺寸
+        self._canvas_size: Tuple[int, int] = (0, 0)  #画布尺寸（用于解码时缩放）
+        self._layout_cache = {}  #缩放布局缓存 {(图像尺寸, 画布尺寸): 布局}
 
-        #线程锁
+        #线程锁：保护计数器自增等读-改-写操作及多字段快照
+        #单个属性的读取在GIL下是原子的，get_*方法不加锁
         self._lock = threading.Lock()
 
+        #解码/显示队列（单槽，仅保留最新帧）
+        self._jpeg_q: queue.Queue = queue.Queue(maxsize=1)
+        self._img_q: queue.Queue = queue.Queue(maxsize=1)
+        self._running = True
+
         #创建UI
         self._create_ui()
 
         #绑定窗口大小变化事件
         self.bind('<Configure>', self._on_resize)
 
+        #启动解码线程组和显示轮询
+        self._decode_threads = [
+            threading.Thread(target=self._decode_worker, name=f"jpeg-dec-{i}", daemon=True)
+            for i in range(self.DECODE_WORKERS)
+        ]
+        for thread in self._decode_threads:
+            thread.start()
+        self.after(self.DISPLAY_POLL_MS, self._drain_img_q)
+        self.after(self.LABEL_UPDATE_MS, self._tick_labels)
+
     def _create_ui(self):
         """创建用户界面"""
         #预览画布
         self.canvas = tk.Canvas(self, bg='black', highlightthickness=0)
         self.canvas.pack(fill=tk.BOTH, expand=True)
+        self.canvas.bind('<Configure>', self._on_canvas_configure)
+        #图像项只创建一次，每帧仅更新图像和位置
+        self._img_id = self.canvas.create_image(0, 0, anchor=tk.NW)
 
         #信息栏
         info_frame = ttk.Frame(self)
@@ -105,11 +227,11 @@ class PreviewWidget(tk.Frame):
         更新预览帧
 
         Args:
-            jpeg_data: JPEG图像数据
+            jpeg_data: JPEG图像数据（bytes或memoryview）
             frame_seq: 帧序号
 
         Returns:
-            True表示成功显示，False表示帧被丢弃或解码失败
+            True表示已提交解码，False表示帧被丢弃
         """
         with self._lock:
             self._frame_count += 1
@@ -117,27 +239,69 @@ class PreviewWidget(tk.Frame):
             #检查帧序号，丢弃过时帧
             if frame_seq <= self._last_frame_seq:
                 self._dropped_count += 1
-                logger.debug(f"丢弃过时帧: seq={frame_seq}, last={self._last_frame_seq}")
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(f"丢弃过时帧: seq={frame_seq}, last={self._last_frame_seq}")
                 return False
 
             self._last_frame_seq = frame_seq
 
-        #解码JPEG
-        try:
-            image = self._decode_jpeg(jpeg_data)
-            if image is None:
-                return False
-        except Exception as e:
-            logger.error(f"JPEG解码失败: {e}")
-            return False
+        #提交给解码线程，未解码的旧帧被替换
+        if _put_latest(self._jpeg_q, (frame_seq, jpeg_data)):
+            with self._lock:
+                self._dropped_count += 1
 
-        #更新帧率统计
-        self._update_fps_stats()
+        return True
 
-        #在主线程中更新显示
-        self.after(0, lambda: self._display_image(image))
+    def _decode_worker(self):
+        """解码线程：取最新JPEG解码，结果放入显示队列"""
+        logger.debug("预览解码线程启动")
+        while self._running:
+            item = self._jpeg_q.get()
+            if item is None:
+                #传递退出标记给其他解码线程
+                _put_latest(self._jpeg_q, None)
+                break
+            frame_seq, jpeg_data = item
+
+            canvas_size = self._canvas_size
+            try:
+                image = self._decode_jpeg(jpeg_data, canvas_size)
+                #在解码线程中缩放到显示尺寸，主线程只拷贝像素
+                if image is not None:
+                    image = self._fit_to_canvas(image, canvas_size)
+            except Exception as e:
+                logger.error(f"JPEG解码失败: {e}")
+                continue
+            if image is None:
+                continue
 
-        return True
+            #其他线程已解码出更新的帧，丢弃本帧
+            with self._lock:
+                if frame_seq <= self._last_decoded_seq:
+                    self._dropped_count += 1
+                    continue
+                self._last_decoded_seq = frame_seq
+
+            #更新帧率统计
+            self._update_fps_stats()
+
+            #未显示的旧图像被替换
+            if _put_latest(self._img_q, image):
+                with self._lock:
+                    self._dropped_count += 1
+        logger.debug("预览解码线程退出")
+
+    def _drain_img_q(self):
+        """显示轮询（主线程调用）：显示最新解码的图像"""
+        if not self._running:
+            return
+        try:
+            image = self._img_q.get_nowait()
+        except queue.Empty:
+            pass
+        else:
+            self._display_image(image)
+        self.after(self.DISPLAY_POLL_MS, self._drain_img_q)
 
     def update_frame_from_protocol(self, data: bytes) -> bool:
         """
@@ -159,7 +323,7 @@ class PreviewWidget(tk.Frame):
         frame_seq, jpeg_data = result
         return self.update_frame(jpeg_data, frame_seq)
 
-    def _parse_preview_data(self, data: bytes) -> Optional[Tuple[int, bytes]]:
+    def _parse_preview_data(self, data: bytes) -> Optional[Tuple[int, memoryview]]:
         """
         解析预览帧数据
 
@@ -167,41 +331,61 @@ class PreviewWidget(tk.Frame):
             data: 数据段
 
         Returns:
-            (帧序号, JPEG数据)，失败返回None
+            (帧序号, JPEG数据视图)，失败返回None
         """
         if len(data) < 8:
             logger.warning(f"预览帧数据太短: {len(data)} < 8")
             return None
 
-        #解析帧序号（4字节大端）
-        frame_seq = struct.unpack('>I', data[:4])[0]
-
-        #解析JPEG长度（4字节大端）
-        jpeg_len = struct.unpack('>I', data[4:8])[0]
+        #解析帧序号和JPEG长度（各4字节大端）
+        frame_seq, jpeg_len = _SEQ_LEN.unpack_from(data, 0)
 
         #检查数据完整性
         if len(data) < 8 + jpeg_len:
             logger.warning(f"预览帧数据不完整: 期望{8+jpeg_len}, 实际{len(data)}")
             return None
 
-        #提取JPEG数据
-        jpeg_data = data[8:8+jpeg_len]
+        #JPEG数据以视图传给解码器，不复制
+        jpeg_data = memoryview(data)[8:8+jpeg_len]
 
-        logger.debug(f"解析预览帧: seq={frame_seq}, jpeg_len={jpeg_len}")
+        #每帧调用，仅在DEBUG级别启用时才格式化消息
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"解析预览帧: seq={frame_seq}, jpeg_len={jpeg_len}")
         return (frame_seq, jpeg_data)
 
-    def _decode_jpeg(self, jpeg_data: bytes) -> Optional[Image.Image]:
+    def _decode_jpeg(self, jpeg_data,
+                     target_size: Optional[Tuple[int, int]] = None) -> Optional[Image.Image]:
         """
         解码JPEG数据
 
+        目标尺寸明显小于原图时，在解码阶段直接按1/2、1/4、1/8缩小（IDCT域缩放），
+        解码结果不小于目标尺寸，剩余的非整数比例由显示时的resize处理
+
         Args:
-            jpeg_data: JPEG字节数据
+            jpeg_data: JPEG数据（bytes或memoryview）
+            target_size: 显示区域尺寸(宽, 高)，为None或无效时按原尺寸解码
 
         Returns:
             PIL Image对象，失败返回None
         """
         try:
+            tj = _get_turbojpeg()
+            if tj is not None:
+                width, height = tj.decode_header(jpeg_data)[:2]
+                self._set_image_size(width, height)
+                factor = _pick_scaling_factor(self._fit_scale(width, height, target_size),
+                                              tj.scaling_factors)
+                #libjpeg-turbo SIMD解码
+                return Image.fromarray(
+                    tj.decode(jpeg_data, pixel_format=TJPF_RGB, scaling_factor=factor), 'RGB')
+
             image = Image.open(io.BytesIO(jpeg_data))
+            width, height = image.size
+            self._set_image_size(width, height)
+            factor = _pick_scaling_factor(self._fit_scale(width, height, target_size))
+            if factor is not None:
+                #Pillow的draft模式同样在解码阶段按2的幂缩小
+                image.draft('RGB', (width * factor[0] // factor[1], height * factor[0] // factor[1]))
             #确保图像已加载
             image.load()
             return image
@@ -217,63 +401,115 @@ class PreviewWidget(tk.Frame):
             image: PIL Image对象
         """
         try:
-            #获取画布尺寸
-            canvas_width = self.canvas.winfo_width()
-            canvas_height = self.canvas.winfo_height()
-
-            if canvas_width <= 1 or canvas_height <= 1:
+            #画布未映射（窗口最小化/隐藏）或尺寸过小时跳过显示
+            canvas_width, canvas_height = self._canvas_size
+            if canvas_width < 8 or canvas_height < 8 or not self.canvas.winfo_ismapped():
                 return
 
-            #保存原始尺寸
-            self._image_size = image.size
-
-            #计算缩放比例（保持宽高比）
-            img_width, img_height = image.size
-            scale_w = canvas_width / img_width
-            scale_h = canvas_height / img_height
-            scale = min(scale_w, scale_h)
-
-            #缩放图像
-            new_width = int(img_width * scale)
-            new_height = int(img_height * scale)
+            #缩放布局（按原图/画布尺寸缓存）
+            new_width, new_height, x, y, resample = self._get_layout(
+                image.size, (canvas_width, canvas_height))
 
             if new_width > 0 and new_height > 0:
-                resized = image.resize((new_width, new_height), Image.Resampling.LANCZOS)
-                self._current_image = ImageTk.PhotoImage(resized)
+                #解码线程已按当前画布缩放时无需再缩放，仅画布尺寸刚变化时才会重新缩放
+                resized = self._fit_to_canvas(image, (canvas_width, canvas_height))
+
+                #显示尺寸不变时复用PhotoImage，仅拷贝像素
+                photo = self._current_image
+                if photo is None or (photo.width(), photo.height()) != (new_width, new_height):
+                    photo = ImageTk.PhotoImage('RGB', (new_width, new_height))
+                    self._current_image = photo
+                    self.canvas.itemconfigure(self._img_id, image=photo)
+                photo.paste(resized)
 
-                #清除画布并显示图像（居中）
-                self.canvas.delete('all')
-                x = (canvas_width - new_width) // 2
-                y = (canvas_height - new_height) // 2
-                self.canvas.create_image(x, y, anchor=tk.NW, image=self._current_image)
+                #更新图像位置（居中）
+                self.canvas.coords(self._img_id, x, y)
 
-            #更新显示计数
+            #更新显示计数（标签由_tick_labels定时刷新）
             with self._lock:
                 self._display_count += 1
 
-            #更新UI标签
-            self._update_labels()
-
         except Exception as e:
             logger.error(f"显示图像失败: {e}")
 
+    def _fit_to_canvas(self, image: Image.Image, canvas_size: Tuple[int, int]) -> Image.Image:
+        """
+        按画布尺寸等比缩放图像（可在解码线程调用）
+
+        Args:
+            image: PIL Image对象
+            canvas_size: 画布尺寸(宽, 高)
+
+        Returns:
+            缩放后的图像，尺寸已匹配或画布无效时返回原图像
+        """
+        if canvas_size[0] <= 1 or canvas_size[1] <= 1:
+            return image
+        new_width, new_height, _, _, resample = self._get_layout(image.size, canvas_size)
+        if new_width <= 0 or new_height <= 0 or (new_width, new_height) == image.size:
+            return image
+        return image.resize((new_width, new_height), resample)
+
+    def _get_layout(self, img_size: Tuple[int, int], canvas_size: Tuple[int, int]) -> Tuple:
+        """
+        获取缩放布局
+
+        预览分辨率和画布尺寸通常保持不变，布局按尺寸对缓存，画布尺寸变化时清空
+
+        Args:
+            img_size: 图像尺寸(宽, 高)
+            canvas_size: 画布尺寸(宽, 高)
+
+        Returns:
+            (缩放宽度, 缩放高度, 左上角x, 左上角y, 重采样滤波器)
+        """
+        key = (img_size, canvas_size)
+        layout = self._layout_cache.get(key)
+        if layout is None:
+            #计算缩放比例（保持宽高比）
+            img_width, img_height = img_size
+            canvas_width, canvas_height = canvas_size
+            scale = min(canvas_width / img_width, canvas_height / img_height)
+
+            new_width = int(img_width * scale)
+            new_height = int(img_height * scale)
+            resample = Image.Resampling.BOX if scale < 0.5 else Image.Resampling.BILINEAR
+            layout = (new_width, new_height,
+                      (canvas_width - new_width) // 2, (canvas_height - new_height) // 2, resample)
+            self._layout_cache[key] = layout
+        return layout
+
+    @staticmethod
+    def _fit_scale(width: int, height: int, target_size: Optional[Tuple[int, int]]) -> float:
+        """计算保持宽高比适配目标区域的缩放比例，目标无效时返回1.0"""
+        if not target_size or target_size[0] <= 1 or target_size[1] <= 1 or width <= 0 or height <= 0:
+            return 1.0
+        return min(target_size[0] / width, target_size[1] / height)
+
+    def _set_image_size(self, width: int, height: int):
+        """记录原始图像尺寸"""
+        with self._lock:
+            self._image_size = (width, height)
+
     def _update_fps_stats(self):
         """更新帧率统计"""
-        current_time = time.time()
+        current_time = time.monotonic()
 
         with self._lock:
             #添加当前时间戳
-            self._fps_timestamps.append(current_time)
+            ts = self._fps_timestamps
+            ts.append(current_time)
 
-            #移除超出窗口的时间戳
+            #从左侧移除超出窗口的时间戳
             cutoff = current_time - self._fps_window
-            self._fps_timestamps = [t for t in self._fps_timestamps if t > cutoff]
+            while ts and ts[0] <= cutoff:
+                ts.popleft()
 
             #计算帧率
-            if len(self._fps_timestamps) >= 2:
-                time_span = self._fps_timestamps[-1] - self._fps_timestamps[0]
+            if len(ts) >= 2:
+                time_span = ts[-1] - ts[0]
                 if time_span > 0:
-                    self._fps = (len(self._fps_timestamps) - 1) / time_span
+                    self._fps = (len(ts) - 1) / time_span
                 else:
                     self._fps = 0.0
             else:
@@ -294,6 +530,18 @@ class PreviewWidget(tk.Frame):
         if img_size[0] > 0 and img_size[1] > 0:
             self.resolution_label.config(text=f"{img_size[0]}x{img_size[1]}")
 
+    def _tick_labels(self):
+        """定时刷新统计标签（主线程调用）"""
+        if not self._running:
+            return
+        self._update_labels()
+        self.after(self.LABEL_UPDATE_MS, self._tick_labels)
+
+    def _on_canvas_configure(self, event):
+        """画布尺寸变化事件，记录尺寸供解码缩放使用"""
+        self._canvas_size = (event.width, event.height)
+        self._layout_cache.clear()
+
     def _on_resize(self, event):
         """窗口大小变化事件"""
         #如果有当前图像，重新显示以适应新尺寸
@@ -302,16 +550,21 @@ class PreviewWidget(tk.Frame):
 
     def clear(self):
         """清除预览显示"""
-        self.canvas.delete('all')
+        #丢弃尚未解码/显示的帧
+        _drain(self._jpeg_q)
+        _drain(self._img_q)
+
+        self.canvas.itemconfigure(self._img_id, image='')
         self._current_image = None
 
         with self._lock:
             self._last_frame_seq = -1
+            self._last_decoded_seq = -1
             self._frame_count = 0
             self._display_count = 0
             self._dropped_count = 0
             self._fps = 0.0
-            self._fps_timestamps = []
+            self._fps_timestamps.clear()
             self._image_size = (0, 0)
 
         #更新标签
@@ -322,6 +575,12 @@ class PreviewWidget(tk.Frame):
 
         logger.info("预览显示已清除")
 
+    def destroy(self):
+        """销毁组件，停止解码线程"""
+        self._running = False
+        _put_latest(self._jpeg_q, None)
+        super().destroy()
+
     def get_fps(self) -> float:
         """
         获取当前帧率
@@ -329,8 +588,7 @@ class PreviewWidget(tk.Frame):
         Returns:
             当前帧率（fps）
         """
-        with self._lock:
-            return self._fps
+        return self._fps
 
     def get_frame_count(self) -> int:
         """
@@ -339,8 +597,7 @@ class PreviewWidget(tk.Frame):
         Returns:
             接收帧数
         """
-        with self._lock:
-            return self._frame_count
+        return self._frame_count
 
     def get_dropped_count(self) -> int:
         """
@@ -349,8 +606,7 @@ class PreviewWidget(tk.Frame):
         Returns:
             丢弃帧数
         """
-        with self._lock:
-            return self._dropped_count
+        return self._dropped_count
 
     def get_display_count(self) -> int:
         """
@@ -359,8 +615,7 @@ class PreviewWidget(tk.Frame):
         Returns:
             显示帧数
         """
-        with self._lock:
-            return self._display_count
+        return self._display_count
 
     def get_image_size(self) -> Tuple[int, int]:
         """
@@ -369,15 +624,14 @@ class PreviewWidget(tk.Frame):
         Returns:
             (宽度, 高度)
         """
-        with self._lock:
-            return self._image_size
+        return self._image_size
 
 
 if __name__ == '__main__':
     #测试代码
     import sys
-    logger.remove()
-    logger.add(sys.stdout, level="DEBUG")
+    import logging
+    logging.basicConfig(level=logging.DEBUG, stream=sys.stdout)
 
     #创建测试窗口
     root = tk.Tk()
@@ -18,8 +18,18 @@
 """
 
 import struct
+import logging
+from functools import lru_cache
 from typing import Optional, Tuple
-from loguru import logger
+
+from logger import logger
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+    logger.info("numpy未安装，XOR校验使用纯Python实现")
 
 
 #协议常量
@@ -27,6 +37,21 @@ FRAME_HEADER = b'\xFE\xFE'
 FRAME_FOOTER = b'\xEF\xEF'
 PROTOCOL_VERSION = 0x20  #v2.0
 
+#预编译的打包/解包格式（大端序）
+_U16 = struct.Struct('>H')
+_U32 = struct.Struct('>I')
+_U16X2 = struct.Struct('>HH')          #分辨率: 宽+高
+_U32X2 = struct.Struct('>II')          #预览帧: 序号+JPEG长度
+_B_U32 = struct.Struct('>BI')          #曝光: 模式+曝光值 / 帧率: 使能+帧率
+_B_U16X3 = struct.Struct('>BHHH')      #白平衡: 模式+R+G+B
+_U32_B_B = struct.Struct('>IBB')       #录像: 时长+分辨率索引+帧率
+
+#XOR校验使用字宽（SWAR）计算的最小数据长度
+XOR_SWAR_THRESHOLD = 64
+
+#最大数据长度（命令码+数据段），超出视为帧头误匹配
+MAX_DATA_LENGTH = 10 * 1024 * 1024
+
 
 #命令码定义 - 控制命令（上位机 → 客户端）
 class Command:
@@ -74,10 +99,35 @@ def calculate_xor(data: bytes) -> int:
     Returns:
         XOR校验值（1字节）
     """
-    result = 0
-    for byte in data:
-        result ^= byte
-    return result
+    n = len(data)
+
+    #短数据直接循环，避免numpy/大整数转换开销
+    if n < XOR_SWAR_THRESHOLD:
+        result = 0
+        for byte in data:
+            result ^= byte
+        return result
+
+    if NUMPY_AVAILABLE:
+        #按8字节字异或（SWAR），再折叠8个字节通道
+        arr = np.frombuffer(data, dtype=np.uint8)
+        n8 = n & ~7
+        x = int(np.bitwise_xor.reduce(arr[:n8].view(np.uint64)))
+        x ^= x >> 32
+        x ^= x >> 16
+        x ^= x >> 8
+        result = x & 0xFF
+        for byte in arr[n8:].tobytes():
+            result ^= byte
+        return result
+
+    #无numpy时：整块转为大整数，逐次对半折叠直到剩1字节
+    x = int.from_bytes(data, 'little')
+    while n > 1:
+        low = (n + 1) // 2
+        x = (x & ((1 << (low * 8)) - 1)) ^ (x >> (low * 8))
+        n = low
+    return x
 
 
 def build_frame(cmd: int, data: bytes = b'', version: int = PROTOCOL_VERSION) -> bytes:
@@ -92,28 +142,34 @@ def build_frame(cmd: int, data: bytes = b'', version: int = PROTOCOL_VERSION) ->
     Returns:
         完整的协议帧字节串
     """
-    #计算长度（命令码+数据段）
-    length = 1 + len(data)
+    data_len = len(data)
 
-    #构建需要校验的部分：版本号+长度(4字节大端)+命令码+数据段
-    payload = bytes([version]) + struct.pack('>I', length) + bytes([cmd]) + data
+    #一次性分配完整帧：帧头(2)+版本(1)+长度(4)+命令码(1)+数据段(N)+校验(1)+帧尾(2)
+    buf = bytearray(11 + data_len)
+    buf[0:2] = FRAME_HEADER
+    buf[2] = version
+    _U32.pack_into(buf, 3, 1 + data_len)  #长度（命令码+数据段）
+    buf[7] = cmd
+    buf[8:8 + data_len] = data
 
-    #计算XOR校验
-    xor_byte = calculate_xor(payload)
+    #XOR校验：版本号+长度+命令码+数据段（memoryview避免复制）
+    buf[8 + data_len] = calculate_xor(memoryview(buf)[2:8 + data_len])
+    buf[9 + data_len:11 + data_len] = FRAME_FOOTER
+    frame = bytes(buf)
 
-    #组装完整帧
-    frame = FRAME_HEADER + payload + bytes([xor_byte]) + FRAME_FOOTER
-
-    logger.debug(f"构建帧: cmd=0x{cmd:02X}, data_len={len(data)}, frame={frame.hex().upper()}")
+    #hex格式化开销随帧长增长，仅在DEBUG级别开启时执行
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(f"构建帧: cmd=0x{cmd:02X}, data_len={len(data)}, frame={frame.hex().upper()}")
     return frame
 
 
-def parse_frame(data: bytes) -> Optional[Tuple[int, int, bytes]]:
+def parse_frame(data) -> Optional[Tuple[int, int, bytes]]:
     """
     解析协议帧
 
     Args:
-        data: 完整的协议帧数据
+        data: 完整的协议帧数据（bytes/bytearray/memoryview，
+              传入接收缓冲区的memoryview可避免提取帧时的复制）
 
     Returns:
         成功返回 (版本号, 命令码, 数据段)，失败返回 None
@@ -137,7 +193,7 @@ def parse_frame(data: bytes) -> Optional[Tuple[int, int, bytes]]:
     version = data[2]
 
     #解析长度（大端序，4字节）
-    length = struct.unpack('>I', data[3:7])[0]
+    length = _U32.unpack_from(data, 3)[0]
 
     #检查帧完整性
     expected_len = 2 + 1 + 4 + length + 1 + 2  #帧头+版本+长度(4)+数据+校验+帧尾
@@ -145,42 +201,58 @@ def parse_frame(data: bytes) -> Optional[Tuple[int, int, bytes]]:
         logger.warning(f"帧长度不匹配: 期望{expected_len}, 实际{len(data)}")
         return None
 
-    #提取命令码和数据段
+    #提取命令码
     cmd = data[7]
-    payload_data = data[8:-3] if length > 1 else b''
 
-    #验证XOR校验
-    payload = data[2:-3]  #版本号+长度+命令码+数据段
-    expected_xor = data[-3]
-    actual_xor = calculate_xor(payload)
+    #验证XOR校验（在memoryview切片上计算，不复制帧数据）
+    with memoryview(data) as mv:
+        expected_xor = data[-3]
+        actual_xor = calculate_xor(mv[2:-3])  #版本号+长度+命令码+数据段
 
     if expected_xor != actual_xor:
         logger.warning(f"XOR校验失败: 期望0x{expected_xor:02X}, 实际0x{actual_xor:02X}")
         return None
 
-    logger.debug(f"解析帧成功: version=0x{version:02X}, cmd=0x{cmd:02X}, data_len={len(payload_data)}")
+    #校验通过后再复制数据段（输入为memoryview时也返回独立的bytes）
+    payload_data = bytes(data[8:-3]) if length > 1 else b''
+
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(f"解析帧成功: version=0x{version:02X}, cmd=0x{cmd:02X}, data_len={len(payload_data)}")
     return (version, cmd, payload_data)
 
 
+#无数据段命令帧（内容固定，导入时构建一次）
+_FRAME_HEARTBEAT = build_frame(Command.HEARTBEAT)
+_FRAME_CAPTURE = build_frame(Command.CAPTURE)
+_FRAME_CONTINUOUS_START = build_frame(Command.CONTINUOUS_START)
+_FRAME_CONTINUOUS_STOP = build_frame(Command.CONTINUOUS_STOP)
+_FRAME_RECORD_STOP = build_frame(Command.RECORD_STOP)
+_FRAME_PREVIEW_STOP = build_frame(Command.PREVIEW_STOP)
+_FRAME_QUERY_STATUS = build_frame(Command.QUERY_STATUS)
+_FRAME_QUERY_PARAMS = build_frame(Command.QUERY_PARAMS)
+_FRAME_QUERY_RESOLUTIONS = build_frame(Command.QUERY_RESOLUTIONS)
+_FRAME_QUERY_GAIN_AUTO = build_frame(Command.QUERY_GAIN_AUTO)
+
+
 #命令封装函数
 def build_heartbeat() -> bytes:
     """构建心跳命令帧"""
-    return build_frame(Command.HEARTBEAT)
+    return _FRAME_HEARTBEAT
 
 
 def build_capture() -> bytes:
     """构建单次拍照命令帧"""
-    return build_frame(Command.CAPTURE)
+    return _FRAME_CAPTURE
 
 
 def build_continuous_start() -> bytes:
     """构建开始连续拍照命令帧"""
-    return build_frame(Command.CONTINUOUS_START)
+    return _FRAME_CONTINUOUS_START
 
 
 def build_continuous_stop() -> bytes:
     """构建停止连续拍照命令帧"""
-    return build_frame(Command.CONTINUOUS_STOP)
+    return _FRAME_CONTINUOUS_STOP
 
 
 def build_record_start(duration: int = 0, resolution_index: int = 0, fps: int = 5) -> bytes:
@@ -195,13 +267,13 @@ def build_record_start(duration: int = 0, resolution_index: int = 0, fps: int =
     Returns:
         命令帧
     """
-    data = struct.pack('>I', duration) + bytes([resolution_index, fps])
+    data = _U32_B_B.pack(duration, resolution_index, fps)
     return build_frame(Command.RECORD_START, data)
 
 
 def build_record_stop() -> bytes:
     """构建停止录像命令帧"""
-    return build_frame(Command.RECORD_STOP)
+    return _FRAME_RECORD_STOP
 
 
 def build_preview_start(resolution_index: int = 0, fps: int = 10) -> bytes:
@@ -221,7 +293,7 @@ def build_preview_start(resolution_index: int = 0, fps: int = 10) -> bytes:
 
 def build_preview_stop() -> bytes:
     """构建停止预览命令帧"""
-    return build_frame(Command.PREVIEW_STOP)
+    return _FRAME_PREVIEW_STOP
 
 
 def build_set_exposure(mode: int, value: int) -> bytes:
@@ -235,7 +307,7 @@ def build_set_exposure(mode: int, value: int) -> bytes:
     Returns:
         命令帧
     """
-    data = bytes([mode]) + struct.pack('>I', value)
+    data = _B_U32.pack(mode, value)
     return build_frame(Command.SET_EXPOSURE, data)
 
 
@@ -252,7 +324,7 @@ def build_set_white_balance(mode: int, r: int = 0, g: int = 0, b: int = 0) -> by
     Returns:
         命令帧
     """
-    data = bytes([mode]) + struct.pack('>HHH', r, g, b)
+    data = _B_U16X3.pack(mode, r, g, b)
     return build_frame(Command.SET_WHITE_BALANCE, data)
 
 
@@ -266,10 +338,11 @@ def build_set_gain(value: int) -> bytes:
     Returns:
         命令帧
     """
-    data = struct.pack('>H', value)
+    data = _U16.pack(value)
     return build_frame(Command.SET_GAIN, data)
 
 
+@lru_cache(maxsize=256)
 def build_set_resolution(width: int, height: int) -> bytes:
     """
     构建设置分辨率命令帧
@@ -281,25 +354,26 @@ def build_set_resolution(width: int, height: int) -> bytes:
     Returns:
         命令帧
     """
-    data = struct.pack('>HH', width, height)
+    data = _U16X2.pack(width, height)
     return build_frame(Command.SET_RESOLUTION, data)
 
 
 def build_query_status() -> bytes:
     """构建查询状态命令帧"""
-    return build_frame(Command.QUERY_STATUS)
+    return _FRAME_QUERY_STATUS
 
 
 def build_query_params() -> bytes:
     """构建查询参数命令帧"""
-    return build_frame(Command.QUERY_PARAMS)
+    return _FRAME_QUERY_PARAMS
 
 
 def build_query_resolutions() -> bytes:
     """构建查询分辨率列表命令帧"""
-    return build_frame(Command.QUERY_RESOLUTIONS)
+    return _FRAME_QUERY_RESOLUTIONS
 
 
+@lru_cache(maxsize=256)
 def build_set_gain_auto(mode: int) -> bytes:
     """
     构建设置自动增益命令帧
@@ -326,10 +400,11 @@ def build_set_frame_rate(fps: int, enable: bool = True) -> bytes:
         命令帧
     """
     #帧率使用4字节大端序存储（帧率*100的整数值）
-    data = bytes([1 if enable else 0]) + struct.pack('>I', fps)
+    data = _B_U32.pack(1 if enable else 0, fps)
     return build_frame(Command.SET_FRAME_RATE, data)
 
 
+@lru_cache(maxsize=256)
 def build_set_pixel_format(format_index: int) -> bytes:
     """
     构建设置像素格式命令帧
@@ -346,7 +421,7 @@ def build_set_pixel_format(format_index: int) -> bytes:
 
 def build_query_gain_auto() -> bytes:
     """构建查询自动增益状态命令帧"""
-    return build_frame(Command.QUERY_GAIN_AUTO)
+    return _FRAME_QUERY_GAIN_AUTO
 
 
 #响应解析函数
@@ -378,7 +453,7 @@ def parse_ack_failed(data: bytes) -> Optional[Tuple[int, int]]:
     if len(data) < 3:
         return None
     cmd = data[0]
-    error_code = struct.unpack('>H', data[1:3])[0]
+    error_code = _U16.unpack_from(data, 1)[0]
     return (cmd, error_code)
 
 
@@ -394,8 +469,7 @@ def parse_preview_frame(data: bytes) -> Optional[Tuple[int, bytes]]:
     """
     if len(data) < 8:
         return None
-    seq = struct.unpack('>I', data[:4])[0]
-    jpeg_len = struct.unpack('>I', data[4:8])[0]
+    seq, jpeg_len = _U32X2.unpack_from(data, 0)
     if len(data) < 8 + jpeg_len:
         return None
     jpeg_data = data[8:8+jpeg_len]
@@ -420,8 +494,8 @@ def parse_gain_auto_report(data: bytes) -> Optional[bool]:
 if __name__ == '__main__':
     #测试代码
     import sys
-    logger.remove()
-    logger.add(sys.stdout, level="DEBUG")
+    import logging
+    logging.basicConfig(level=logging.DEBUG, stream=sys.stdout)
 
     #测试心跳帧
     heartbeat = build_heartbeat()
@@ -11,12 +11,102 @@
 """
 
 import tkinter as tk
-from tkinter import ttk, filedialog, messagebox
+from tkinter import ttk, messagebox
 import json
 import os
-from typing import Any, Dict, Optional, Callable
+import copy
+import time
+from types import MappingProxyType
+from typing import Any, Dict, Optional, Callable, Tuple
 from pathlib import Path
-from loguru import logger
+
+from logger import logger
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+    logger.info("orjson未安装，配置文件使用标准库json读写")
+
+
+def _json_loads(data: bytes) -> Any:
+    """解析JSON字节数据（orjson.JSONDecodeError是json.JSONDecodeError的子类）"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _json_dumps(obj: Any) -> bytes:
+    """序列化为UTF-8编码的JSON（2空格缩进，不转义非ASCII字符）"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2, ensure_ascii=False).encode('utf-8')
+
+
+#默认配置文件路径: gui/config/settings.json
+_DEFAULT_CONFIG_PATH = Path(__file__).resolve().parent.parent / "config" / "settings.json"
+
+#配置缓存有效期（秒）
+SETTINGS_CACHE_TTL = 5.0
+
+#配置缓存 {配置文件路径: (文件修改时间, 缓存时间, 合并默认值后的配置)}
+_SETTINGS_CACHE: Dict[Path, Tuple[float, float, Dict]] = {}
+
+
+def _merge_defaults(defaults: Dict, settings: Dict) -> Dict:
+    """
+    合并默认配置
+
+    配置固定为两层结构（分区 -> 标量字段），逐分区用文件中的值覆盖默认值，
+    文件中缺失或格式不对的分区使用默认值
+
+    Args:
+        defaults: 默认配置
+        settings: 配置文件内容
+
+    Returns:
+        合并后的新配置字典
+    """
+    result = {}
+    for section, values in defaults.items():
+        override = settings.get(section)
+        result[section] = {**values, **override} if isinstance(override, dict) else dict(values)
+    return result
+
+
+def _load_cached(config_path: Path, defaults: Dict) -> Optional[Dict]:
+    """
+    读取配置文件并合并默认配置
+
+    结果按路径缓存，文件修改时间不变且未超过有效期时直接返回缓存副本
+
+    Args:
+        config_path: 配置文件路径
+        defaults: 默认配置
+
+    Returns:
+        配置字典（调用方可修改的副本），文件不存在返回None
+
+    Raises:
+        json.JSONDecodeError: 配置文件格式错误
+        OSError: 读取文件失败
+    """
+    try:
+        mtime = config_path.stat().st_mtime
+    except FileNotFoundError:
+        return None
+
+    now = time.monotonic()
+    cached = _SETTINGS_CACHE.get(config_path)
+    if cached is not None and cached[0] == mtime and now - cached[1] < SETTINGS_CACHE_TTL:
+        return copy.deepcopy(cached[2])
+
+    #一次读入全部字节交给json解码（UTF-8），避免文本流的多次小块读取
+    settings = _json_loads(config_path.read_bytes())
+    merged = _merge_defaults(defaults, settings)
+    _SETTINGS_CACHE[config_path] = (mtime, now, merged)
+    return copy.deepcopy(merged)
 
 
 class SettingsDialog:
@@ -29,7 +119,8 @@ class SettingsDialog:
             "port": 8899,
             "timeout": 5,
             "auto_reconnect": True,
-            "reconnect_interval": 5
+            "reconnect_interval": 5,
+            "heartbeat": True
         },
         "storage": {
             "image_path": "./images",
@@ -49,16 +140,67 @@ class SettingsDialog:
         }
     }
 
+    #默认配置的序列化副本，解析即得到互不共享的深拷贝
+    _DEFAULT_BLOB = json.dumps(DEFAULT_SETTINGS).encode('utf-8')
+
+    #默认配置对外只读（合并时直接读取，无需复制），需要可修改的副本时使用_default_settings()
+    DEFAULT_SETTINGS = MappingProxyType(
+        {section: MappingProxyType(values) for section, values in DEFAULT_SETTINGS.items()})
+
+    #对话框尺寸(宽, 高)
+    DIALOG_SIZE = (500, 550)
+
     #支持的分辨率列表
     RESOLUTIONS = [
         "1920x1080",
         "1280x720",
         "640x480"
     ]
+    #分辨率 -> 索引
+    _RESOLUTION_INDEX = {r: i for i, r in enumerate(RESOLUTIONS)}
 
     #日志级别列表
     LOG_LEVELS = ["DEBUG", "INFO", "WARNING", "ERROR"]
 
+    #数值校验规则: (控件变量名, 名称, 最小值, 最大值)，最大值为None表示无上限
+    _NUMERIC_RULES = (
+        ("conn_port", "端口号", 1, 65535),
+        ("conn_timeout", "连接超时", 1, None),
+        ("preview_fps", "帧率", 1, 30),
+        ("storage_jpeg_quality", "存储JPEG质量", 1, 100),
+        ("preview_jpeg_quality", "预览JPEG质量", 1, 100),
+    )
+
+    #界面描述: (选项卡标题, 配置分区, ((控件变量名, 配置键, 标签, 控件类型, 选项), ...))
+    #控件类型: entry(选项=宽度) / spin(选项=(最小, 最大)) / check / path /
+    #          combo(选项=(可选值, 配置是否存索引)) / scale(选项=(最小, 最大))
+    _FORM_SPEC = (
+        ("连接设置", "connection", (
+            ("conn_host", "host", "服务器地址", "entry", 30),
+            ("conn_port", "port", "服务器端口", "spin", (1, 65535)),
+            ("conn_timeout", "timeout", "连接超时(秒)", "spin", (1, 60)),
+            ("conn_auto_reconnect", "auto_reconnect", "自动重连", "check", None),
+            ("conn_reconnect_interval", "reconnect_interval", "重连间隔(秒)", "spin", (1, 60)),
+            ("conn_heartbeat", "heartbeat", "发送心跳（关闭后仅依赖TCP保活）", "check", None),
+        )),
+        ("存储设置", "storage", (
+            ("storage_image_path", "image_path", "图片保存路径", "path", None),
+            ("storage_video_path", "video_path", "视频保存路径", "path", None),
+            ("storage_jpeg_quality", "jpeg_quality", "JPEG质量", "scale", (1, 100)),
+        )),
+        ("预览设置", "preview", (
+            ("preview_resolution", "resolution_index", "默认分辨率", "combo", (RESOLUTIONS, True)),
+            ("preview_fps", "fps", "默认帧率(fps)", "spin", (1, 30)),
+            ("preview_jpeg_quality", "jpeg_quality", "JPEG质量", "scale", (1, 100)),
+        )),
+        ("日志设置", "log", (
+            ("log_level", "level", "日志级别", "combo", (LOG_LEVELS, False)),
+            ("log_path", "path", "日志保存路径", "path", None),
+            ("log_max_size", "max_size_mb", "单文件大小(MB)", "spin", (1, 100)),
+            ("log_backup_count", "backup_count", "保留文件数", "spin", (1, 50)),
+        )),
+    )
+
     def __init__(self, parent: tk.Tk, on_save: Optional[Callable[[Dict], None]] = None):
         """
         初始化配置对话框
@@ -73,63 +215,52 @@ class SettingsDialog:
         self.result: Optional[Dict] = None
 
         #配置文件路径
-        self._config_path = self._get_config_path()
+        self._config_path: Path = self._get_config_path()
 
         #加载当前配置
         self._settings = self._load_settings()
 
         #控件变量
         self._vars: Dict[str, tk.Variable] = {}
+        #滑块数值标签 {控件变量名: 标签}
+        self._scale_labels: Dict[str, ttk.Label] = {}
 
-    def _get_config_path(self) -> str:
+    def _get_config_path(self) -> Path:
         """获取配置文件路径"""
-        #gui/config/settings.json
-        base_dir = Path(__file__).parent.parent
-        config_dir = base_dir / "config"
-        return str(config_dir / "settings.json")
+        return _DEFAULT_CONFIG_PATH
 
     def _load_settings(self) -> Dict[str, Any]:
         """加载配置文件"""
-        try:
-            if os.path.exists(self._config_path):
-                with open(self._config_path, 'r', encoding='utf-8') as f:
-                    settings = json.load(f)
-                logger.info(f"配置文件加载成功: {self._config_path}")
-                #合并默认配置
-                return self._merge_defaults(settings)
-            else:
-                logger.info("配置文件不存在，使用默认配置")
-                return self.DEFAULT_SETTINGS.copy()
-        except json.JSONDecodeError as e:
-            logger.error(f"配置文件JSON格式错误: {e}")
-            return self.DEFAULT_SETTINGS.copy()
-        except Exception as e:
-            logger.error(f"加载配置文件失败: {e}")
-            return self.DEFAULT_SETTINGS.copy()
-
-    def _merge_defaults(self, settings: Dict) -> Dict:
-        """合并默认配置"""
-        def merge_dict(base: dict, override: dict) -> dict:
-            result = base.copy()
-            for key, value in override.items():
-                if key in result and isinstance(result[key], dict) and isinstance(value, dict):
-                    result[key] = merge_dict(result[key], value)
-                else:
-                    result[key] = value
-            return result
-
-        return merge_dict(self.DEFAULT_SETTINGS, settings)
+        return self.get_settings(self._config_path)
 
     def _save_settings(self) -> bool:
         """保存配置到文件"""
         try:
-            #确保目录存在
-            config_dir = os.path.dirname(self._config_path)
-            if config_dir and not os.path.exists(config_dir):
-                os.makedirs(config_dir)
+            data = _json_dumps(self._settings)
+
+            #内容与文件一致时不重写（减少SD卡/闪存写入）
+            try:
+                if self._config_path.read_bytes() == data:
+                    logger.info(f"配置未变化，跳过写入: {self._config_path}")
+                    return True
+            except OSError:
+                pass
 
-            with open(self._config_path, 'w', encoding='utf-8') as f:
-                json.dump(self._settings, f, indent=2, ensure_ascii=False)
+            #确保目录存在
+            self._config_path.parent.mkdir(parents=True, exist_ok=True)
+
+            #先写临时文件再替换，写入中途崩溃不会留下残缺的配置文件
+            tmp_path = self._config_path.with_name(self._config_path.name + ".tmp")
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+                f.flush()
+                try:
+                    os.fsync(f.fileno())
+                except OSError:
+                    pass
+            os.replace(tmp_path, self._config_path)
+            #文件已更新，使缓存失效
+            _SETTINGS_CACHE.pop(self._config_path, None)
             logger.info(f"配置文件保存成功: {self._config_path}")
             return True
         except Exception as e:
@@ -145,15 +276,14 @@ class SettingsDialog:
         """
         self.dialog = tk.Toplevel(self.parent)
         self.dialog.title("设置")
-        self.dialog.geometry("500x550")
         self.dialog.resizable(False, False)
         self.dialog.transient(self.parent)
         self.dialog.grab_set()
 
-        #居中显示
+        #居中显示（尺寸固定，一次设置大小和位置）
         self._center_dialog()
 
-        #创建界面
+        #创建界面（几何计算由Tk在空闲时统一进行）
         self._create_ui()
 
         #等待对话框关闭
@@ -163,12 +293,11 @@ class SettingsDialog:
 
     def _center_dialog(self):
         """居中显示对话框"""
-        self.dialog.update_idletasks()
-        width = self.dialog.winfo_width()
-        height = self.dialog.winfo_height()
+        #对话框尺寸固定，无需update_idletasks强制布局后再读取窗口尺寸
+        width, height = self.DIALOG_SIZE
         x = (self.dialog.winfo_screenwidth() // 2) - (width // 2)
         y = (self.dialog.winfo_screenheight() // 2) - (height // 2)
-        self.dialog.geometry(f"+{x}+{y}")
+        self.dialog.geometry(f"{width}x{height}+{x}+{y}")
 
     def _create_ui(self):
         """创建用户界面"""
@@ -180,201 +309,77 @@ class SettingsDialog:
         notebook = ttk.Notebook(main_frame)
         notebook.pack(fill=tk.BOTH, expand=True, pady=(0, 10))
 
-        #连接设置选项卡
-        conn_frame = ttk.Frame(notebook, padding="10")
-        notebook.add(conn_frame, text="连接设置")
-        self._create_connection_tab(conn_frame)
-
-        #存储设置选项卡
-        storage_frame = ttk.Frame(notebook, padding="10")
-        notebook.add(storage_frame, text="存储设置")
-        self._create_storage_tab(storage_frame)
-
-        #预览设置选项卡
-        preview_frame = ttk.Frame(notebook, padding="10")
-        notebook.add(preview_frame, text="预览设置")
-        self._create_preview_tab(preview_frame)
-
-        #日志设置选项卡
-        log_frame = ttk.Frame(notebook, padding="10")
-        notebook.add(log_frame, text="日志设置")
-        self._create_log_tab(log_frame)
+        #按表格描述创建各选项卡
+        for tab_title, section, fields in self._FORM_SPEC:
+            tab_frame = ttk.Frame(notebook, padding="10")
+            notebook.add(tab_frame, text=tab_title)
+            self._build_tab(tab_frame, section, fields)
 
         #底部按钮
         self._create_buttons(main_frame)
 
-    def _create_connection_tab(self, parent):
-        """创建连接设置选项卡"""
-        #服务器地址
-        row = 0
-        ttk.Label(parent, text="服务器地址:").grid(row=row, column=0, sticky=tk.W, pady=5)
-        self._vars["conn_host"] = tk.StringVar(value=self._settings["connection"]["host"])
-        host_entry = ttk.Entry(parent, textvariable=self._vars["conn_host"], width=30)
-        host_entry.grid(row=row, column=1, sticky=tk.W, pady=5)
-
-        #服务器端口
-        row += 1
-        ttk.Label(parent, text="服务器端口:").grid(row=row, column=0, sticky=tk.W, pady=5)
-        self._vars["conn_port"] = tk.IntVar(value=self._settings["connection"]["port"])
-        port_spinbox = ttk.Spinbox(parent, textvariable=self._vars["conn_port"],
-                                   from_=1, to=65535, width=10)
-        port_spinbox.grid(row=row, column=1, sticky=tk.W, pady=5)
-
-        #连接超时
-        row += 1
-        ttk.Label(parent, text="连接超时(秒):").grid(row=row, column=0, sticky=tk.W, pady=5)
-        self._vars["conn_timeout"] = tk.IntVar(value=self._settings["connection"]["timeout"])
-        timeout_spinbox = ttk.Spinbox(parent, textvariable=self._vars["conn_timeout"],
-                                      from_=1, to=60, width=10)
-        timeout_spinbox.grid(row=row, column=1, sticky=tk.W, pady=5)
-
-        #自动重连
-        row += 1
-        self._vars["conn_auto_reconnect"] = tk.BooleanVar(
-            value=self._settings["connection"]["auto_reconnect"])
-        auto_reconnect_check = ttk.Checkbutton(parent, text="自动重连",
-                                                variable=self._vars["conn_auto_reconnect"])
-        auto_reconnect_check.grid(row=row, column=0, columnspan=2, sticky=tk.W, pady=5)
-
-        #重连间隔
-        row += 1
-        ttk.Label(parent, text="重连间隔(秒):").grid(row=row, column=0, sticky=tk.W, pady=5)
-        self._vars["conn_reconnect_interval"] = tk.IntVar(
-            value=self._settings["connection"]["reconnect_interval"])
-        reconnect_spinbox = ttk.Spinbox(parent, textvariable=self._vars["conn_reconnect_interval"],
-                                        from_=1, to=60, width=10)
-        reconnect_spinbox.grid(row=row, column=1, sticky=tk.W, pady=5)
-
-    def _create_storage_tab(self, parent):
-        """创建存储设置选项卡"""
-        #图片保存路径
-        row = 0
-        ttk.Label(parent, text="图片保存路径:").grid(row=row, column=0, sticky=tk.W, pady=5)
-        path_frame = ttk.Frame(parent)
-        path_frame.grid(row=row, column=1, sticky=tk.W, pady=5)
-
-        self._vars["storage_image_path"] = tk.StringVar(
-            value=self._settings["storage"]["image_path"])
-        image_path_entry = ttk.Entry(path_frame, textvariable=self._vars["storage_image_path"],
-                                     width=25)
-        image_path_entry.pack(side=tk.LEFT)
-        ttk.Button(path_frame, text="浏览...",
-                   command=lambda: self._browse_folder("storage_image_path")).pack(side=tk.LEFT, padx=5)
-
-        #视频保存路径
-        row += 1
-        ttk.Label(parent, text="视频保存路径:").grid(row=row, column=0, sticky=tk.W, pady=5)
-        video_path_frame = ttk.Frame(parent)
-        video_path_frame.grid(row=row, column=1, sticky=tk.W, pady=5)
-
-        self._vars["storage_video_path"] = tk.StringVar(
-            value=self._settings["storage"]["video_path"])
-        video_path_entry = ttk.Entry(video_path_frame, textvariable=self._vars["storage_video_path"],
-                                     width=25)
-        video_path_entry.pack(side=tk.LEFT)
-        ttk.Button(video_path_frame, text="浏览...",
-                   command=lambda: self._browse_folder("storage_video_path")).pack(side=tk.LEFT, padx=5)
-
-        #JPEG质量
-        row += 1
-        ttk.Label(parent, text="JPEG质量:").grid(row=row, column=0, sticky=tk.W, pady=5)
-        quality_frame = ttk.Frame(parent)
-        quality_frame.grid(row=row, column=1, sticky=tk.W, pady=5)
-
-        self._vars["storage_jpeg_quality"] = tk.IntVar(
-            value=self._settings["storage"]["jpeg_quality"])
-        quality_scale = ttk.Scale(quality_frame, from_=1, to=100,
-                                  variable=self._vars["storage_jpeg_quality"],
+    def _build_tab(self, parent, section: str, fields: tuple):
+        """
+        按字段描述创建选项卡内容
+
+        Args:
+            parent: 选项卡框架
+            section: 配置分区名
+            fields: 字段描述元组，见_FORM_SPEC
+        """
+        values = self._settings[section]
+        for row, (var_name, key, label, kind, option) in enumerate(fields):
+            value = values[key]
+
+            #复选框独占一行，不需要标签
+            if kind == "check":
+                self._vars[var_name] = var = tk.BooleanVar(value=value)
+                ttk.Checkbutton(parent, text=label, variable=var).grid(
+                    row=row, column=0, columnspan=2, sticky=tk.W, pady=5)
+                continue
+
+            ttk.Label(parent, text=f"{label}:").grid(row=row, column=0, sticky=tk.W, pady=5)
+
+            if kind == "entry":
+                self._vars[var_name] = var = tk.StringVar(value=value)
+                widget = ttk.Entry(parent, textvariable=var, width=option)
+
+            elif kind == "spin":
+                self._vars[var_name] = var = tk.IntVar(value=value)
+                widget = ttk.Spinbox(parent, textvariable=var, from_=option[0], to=option[1], width=10)
+
+            elif kind == "combo":
+                #配置值为选项文本，或为选项索引（如分辨率）
+                choices, by_index = option
+                if by_index:
+                    value = choices[value] if 0 <= value < len(choices) else choices[0]
+                self._vars[var_name] = var = tk.StringVar(value=value)
+                widget = ttk.Combobox(parent, textvariable=var, values=choices,
+                                      state="readonly", width=15)
+
+            elif kind == "path":
+                self._vars[var_name] = var = tk.StringVar(value=value)
+                widget = ttk.Frame(parent)
+                ttk.Entry(widget, textvariable=var, width=25).pack(side=tk.LEFT)
+                ttk.Button(widget, text="浏览...",
+                           command=lambda name=var_name: self._browse_folder(name)).pack(
+                    side=tk.LEFT, padx=5)
+
+            else:  #scale
+                self._vars[var_name] = var = tk.IntVar(value=value)
+                widget = ttk.Frame(parent)
+                scale = ttk.Scale(widget, from_=option[0], to=option[1], variable=var,
                                   orient=tk.HORIZONTAL, length=150)
-        quality_scale.pack(side=tk.LEFT)
-
-        self._storage_quality_label = ttk.Label(quality_frame,
-                                                 text=str(self._settings["storage"]["jpeg_quality"]))
-        self._storage_quality_label.pack(side=tk.LEFT, padx=5)
-
-        #绑定滑块值变化
-        self._vars["storage_jpeg_quality"].trace_add("write",
-            lambda *args: self._storage_quality_label.config(
-                text=str(self._vars["storage_jpeg_quality"].get())))
-
-    def _create_preview_tab(self, parent):
-        """创建预览设置选项卡"""
-        #默认分辨率
-        row = 0
-        ttk.Label(parent, text="默认分辨率:").grid(row=row, column=0, sticky=tk.W, pady=5)
-        self._vars["preview_resolution"] = tk.StringVar(
-            value=self.RESOLUTIONS[self._settings["preview"]["resolution_index"]])
-        resolution_combo = ttk.Combobox(parent, textvariable=self._vars["preview_resolution"],
-                                        values=self.RESOLUTIONS, state="readonly", width=15)
-        resolution_combo.grid(row=row, column=1, sticky=tk.W, pady=5)
-
-        #默认帧率
-        row += 1
-        ttk.Label(parent, text="默认帧率(fps):").grid(row=row, column=0, sticky=tk.W, pady=5)
-        self._vars["preview_fps"] = tk.IntVar(value=self._settings["preview"]["fps"])
-        fps_spinbox = ttk.Spinbox(parent, textvariable=self._vars["preview_fps"],
-                                  from_=1, to=30, width=10)
-        fps_spinbox.grid(row=row, column=1, sticky=tk.W, pady=5)
-
-        #JPEG质量
-        row += 1
-        ttk.Label(parent, text="JPEG质量:").grid(row=row, column=0, sticky=tk.W, pady=5)
-        preview_quality_frame = ttk.Frame(parent)
-        preview_quality_frame.grid(row=row, column=1, sticky=tk.W, pady=5)
-
-        self._vars["preview_jpeg_quality"] = tk.IntVar(
-            value=self._settings["preview"]["jpeg_quality"])
-        preview_quality_scale = ttk.Scale(preview_quality_frame, from_=1, to=100,
-                                          variable=self._vars["preview_jpeg_quality"],
-                                          orient=tk.HORIZONTAL, length=150)
-        preview_quality_scale.pack(side=tk.LEFT)
-
-        self._preview_quality_label = ttk.Label(preview_quality_frame,
-                                                 text=str(self._settings["preview"]["jpeg_quality"]))
-        self._preview_quality_label.pack(side=tk.LEFT, padx=5)
-
-        #绑定滑块值变化
-        self._vars["preview_jpeg_quality"].trace_add("write",
-            lambda *args: self._preview_quality_label.config(
-                text=str(self._vars["preview_jpeg_quality"].get())))
-
-    def _create_log_tab(self, parent):
-        """创建日志设置选项卡"""
-        #日志级别
-        row = 0
-        ttk.Label(parent, text="日志级别:").grid(row=row, column=0, sticky=tk.W, pady=5)
-        self._vars["log_level"] = tk.StringVar(value=self._settings["log"]["level"])
-        level_combo = ttk.Combobox(parent, textvariable=self._vars["log_level"],
-                                   values=self.LOG_LEVELS, state="readonly", width=15)
-        level_combo.grid(row=row, column=1, sticky=tk.W, pady=5)
-
-        #日志保存路径
-        row += 1
-        ttk.Label(parent, text="日志保存路径:").grid(row=row, column=0, sticky=tk.W, pady=5)
-        log_path_frame = ttk.Frame(parent)
-        log_path_frame.grid(row=row, column=1, sticky=tk.W, pady=5)
-
-        self._vars["log_path"] = tk.StringVar(value=self._settings["log"]["path"])
-        log_path_entry = ttk.Entry(log_path_frame, textvariable=self._vars["log_path"], width=25)
-        log_path_entry.pack(side=tk.LEFT)
-        ttk.Button(log_path_frame, text="浏览...",
-                   command=lambda: self._browse_folder("log_path")).pack(side=tk.LEFT, padx=5)
-
-        #单文件最大大小
-        row += 1
-        ttk.Label(parent, text="单文件大小(MB):").grid(row=row, column=0, sticky=tk.W, pady=5)
-        self._vars["log_max_size"] = tk.IntVar(value=self._settings["log"]["max_size_mb"])
-        max_size_spinbox = ttk.Spinbox(parent, textvariable=self._vars["log_max_size"],
-                                       from_=1, to=100, width=10)
-        max_size_spinbox.grid(row=row, column=1, sticky=tk.W, pady=5)
-
-        #保留文件数
-        row += 1
-        ttk.Label(parent, text="保留文件数:").grid(row=row, column=0, sticky=tk.W, pady=5)
-        self._vars["log_backup_count"] = tk.IntVar(value=self._settings["log"]["backup_count"])
-        backup_spinbox = ttk.Spinbox(parent, textvariable=self._vars["log_backup_count"],
-                                     from_=1, to=50, width=10)
-        backup_spinbox.grid(row=row, column=1, sticky=tk.W, pady=5)
+                scale.pack(side=tk.LEFT)
+                value_label = ttk.Label(widget, text=str(value))
+                value_label.pack(side=tk.LEFT, padx=5)
+                self._scale_labels[var_name] = value_label
+
+                #滑块拖动时更新数值标签（代码设置变量时由_update_ui_from_settings刷新）
+                scale.configure(
+                    command=lambda val, l=value_label: l.config(text=str(int(float(val)))))
+
+            widget.grid(row=row, column=1, sticky=tk.W, pady=5)
 
     def _create_buttons(self, parent):
         """创建底部按钮"""
@@ -392,8 +397,11 @@ class SettingsDialog:
 
     def _browse_folder(self, var_name: str):
         """浏览文件夹"""
+        #文件对话框仅在此处使用，首次点击"浏览"时再导入
+        from tkinter import filedialog
+
         current_path = self._vars[var_name].get()
-        initial_dir = current_path if os.path.isdir(current_path) else "."
+        initial_dir = current_path if current_path and Path(current_path).is_dir() else "."
 
         folder = filedialog.askdirectory(
             parent=self.dialog,
@@ -412,80 +420,54 @@ class SettingsDialog:
             错误信息列表
         """
         errors = []
+        v = self._vars
 
-        #验证端口
-        try:
-            port = self._vars["conn_port"].get()
-            if not 1 <= port <= 65535:
-                errors.append(f"端口号无效: {port}，有效范围1-65535")
-        except tk.TclError:
-            errors.append("端口号必须是数字")
-
-        #验证超时
-        try:
-            timeout = self._vars["conn_timeout"].get()
-            if timeout <= 0:
-                errors.append(f"连接超时无效: {timeout}，必须大于0")
-        except tk.TclError:
-            errors.append("连接超时必须是数字")
-
-        #验证帧率
-        try:
-            fps = self._vars["preview_fps"].get()
-            if not 1 <= fps <= 30:
-                errors.append(f"帧率无效: {fps}，有效范围1-30")
-        except tk.TclError:
-            errors.append("帧率必须是数字")
+        for var_name, name, low, high in self._NUMERIC_RULES:
+            try:
+                value = v[var_name].get()
+            except tk.TclError:
+                errors.append(f"{name}必须是数字")
+                continue
 
-        #验证JPEG质量
-        try:
-            storage_quality = self._vars["storage_jpeg_quality"].get()
-            if not 1 <= storage_quality <= 100:
-                errors.append(f"存储JPEG质量无效: {storage_quality}，有效范围1-100")
-        except tk.TclError:
-            errors.append("存储JPEG质量必须是数字")
-
-        try:
-            preview_quality = self._vars["preview_jpeg_quality"].get()
-            if not 1 <= preview_quality <= 100:
-                errors.append(f"预览JPEG质量无效: {preview_quality}，有效范围1-100")
-        except tk.TclError:
-            errors.append("预览JPEG质量必须是数字")
+            if high is None:
+                if value < low:
+                    errors.append(f"{name}无效: {value}，必须大于{low - 1}")
+            elif not low <= value <= high:
+                errors.append(f"{name}无效: {value}，有效范围{low}-{high}")
 
         return errors
 
     def _collect_settings(self) -> Dict:
         """收集界面上的配置值"""
+        v = self._vars
+
         #获取分辨率索引
-        resolution_str = self._vars["preview_resolution"].get()
-        try:
-            resolution_index = self.RESOLUTIONS.index(resolution_str)
-        except ValueError:
-            resolution_index = 0
+        resolution_index = self._RESOLUTION_INDEX.get(v["preview_resolution"].get(), 0)
 
         return {
             "connection": {
-                "host": self._vars["conn_host"].get(),
-                "port": self._vars["conn_port"].get(),
-                "timeout": self._vars["conn_timeout"].get(),
-                "auto_reconnect": self._vars["conn_auto_reconnect"].get(),
-                "reconnect_interval": self._vars["conn_reconnect_interval"].get()
+                "host": v["conn_host"].get(),
+                "port": v["conn_port"].get(),
+                "timeout": v["conn_timeout"].get(),
+                "auto_reconnect": v["conn_auto_reconnect"].get(),
+                "reconnect_interval": v["conn_reconnect_interval"].get(),
+                "heartbeat": v["conn_heartbeat"].get()
             },
             "storage": {
-                "image_path": self._vars["storage_image_path"].get(),
-                "video_path": self._vars["storage_video_path"].get(),
-                "jpeg_quality": self._vars["storage_jpeg_quality"].get()
+                "image_path": v["storage_image_path"].get(),
+                "video_path": v["storage_video_path"].get(),
+                "jpeg_quality": v["storage_jpeg_quality"].get()
             },
             "preview": {
                 "resolution_index": resolution_index,
-                "fps": self._vars["preview_fps"].get(),
-                "jpeg_quality": self._vars["preview_jpeg_quality"].get()
+                "fps": v["preview_fps"].get(),
+                "jpeg_quality": v["preview_jpeg_quality"].get()
             },
             "log": {
-                "level": self._vars["log_level"].get(),
-                "path": self._vars["log_path"].get(),
-                "max_size_mb": self._vars["log_max_size"].get(),
-                "backup_count": self._vars["log_backup_count"].get()
+                "level": v["log_level"].get(),
+                "path": v["log_path"].get(),
+                "max_size_mb": v["log_max_size"].get(),
+                "backup_count": v["log_backup_count"].get()
             }
         }
 
@@ -521,77 +503,90 @@ class SettingsDialog:
     def _on_reset(self):
         """恢复默认按钮点击"""
         if messagebox.askyesno("确认", "确定要恢复默认配置吗？", parent=self.dialog):
-            self._settings = self.DEFAULT_SETTINGS.copy()
+            self._settings = self._default_settings()
             self._update_ui_from_settings()
             logger.info("配置已恢复为默认值")
 
     def _update_ui_from_settings(self):
         """从配置更新界面"""
+        v = self._vars
+
         #连接设置
-        self._vars["conn_host"].set(self._settings["connection"]["host"])
-        self._vars["conn_port"].set(self._settings["connection"]["port"])
-        self._vars["conn_timeout"].set(self._settings["connection"]["timeout"])
-        self._vars["conn_auto_reconnect"].set(self._settings["connection"]["auto_reconnect"])
-        self._vars["conn_reconnect_interval"].set(self._settings["connection"]["reconnect_interval"])
+        c = self._settings["connection"]
+        v["conn_host"].set(c["host"])
+        v["conn_port"].set(c["port"])
+        v["conn_timeout"].set(c["timeout"])
+        v["conn_auto_reconnect"].set(c["auto_reconnect"])
+        v["conn_reconnect_interval"].set(c["reconnect_interval"])
+        v["conn_heartbeat"].set(c["heartbeat"])
 
         #存储设置
-        self._vars["storage_image_path"].set(self._settings["storage"]["image_path"])
-        self._vars["storage_video_path"].set(self._settings["storage"]["video_path"])
-        self._vars["storage_jpeg_quality"].set(self._settings["storage"]["jpeg_quality"])
+        st = self._settings["storage"]
+        v["storage_image_path"].set(st["image_path"])
+        v["storage_video_path"].set(st["video_path"])
+        v["storage_jpeg_quality"].set(st["jpeg_quality"])
 
         #预览设置
-        resolution_index = self._settings["preview"]["resolution_index"]
+        p = self._settings["preview"]
+        resolution_index = p["resolution_index"]
         if 0 <= resolution_index < len(self.RESOLUTIONS):
-            self._vars["preview_resolution"].set(self.RESOLUTIONS[resolution_index])
-        self._vars["preview_fps"].set(self._settings["preview"]["fps"])
-        self._vars["preview_jpeg_quality"].set(self._settings["preview"]["jpeg_quality"])
+            v["preview_resolution"].set(self.RESOLUTIONS[resolution_index])
+        v["preview_fps"].set(p["fps"])
+        v["preview_jpeg_quality"].set(p["jpeg_quality"])
 
         #日志设置
-        self._vars["log_level"].set(self._settings["log"]["level"])
-        self._vars["log_path"].set(self._settings["log"]["path"])
-        self._vars["log_max_size"].set(self._settings["log"]["max_size_mb"])
-        self._vars["log_backup_count"].set(self._settings["log"]["backup_count"])
+        lg = self._settings["log"]
+        v["log_level"].set(lg["level"])
+        v["log_path"].set(lg["path"])
+        v["log_max_size"].set(lg["max_size_mb"])
+        v["log_backup_count"].set(lg["backup_count"])
+
+        #滑块数值标签
+        for var_name, value_label in self._scale_labels.items():
+            value_label.config(text=str(v[var_name].get()))
 
     @classmethod
-    def get_settings(cls, config_path: Optional[str] = None) -> Dict:
+    def _default_settings(cls) -> Dict:
+        """
+        获取默认配置的深拷贝
+
+        Returns:
+            默认配置字典（修改不影响DEFAULT_SETTINGS）
+        """
+        return _json_loads(cls._DEFAULT_BLOB)
+
+    @classmethod
+    def get_settings(cls, config_path=None) -> Dict:
         """
         获取当前配置（不显示对话框）
 
         Args:
-            config_path: 配置文件路径，为None时使用默认路径
+            config_path: 配置文件路径（str或Path），为None时使用默认路径
 
         Returns:
             配置字典
         """
-        if config_path is None:
-            base_dir = Path(__file__).parent.parent
-            config_path = str(base_dir / "config" / "settings.json")
+        config_path = _DEFAULT_CONFIG_PATH if config_path is None else Path(config_path)
 
         try:
-            if os.path.exists(config_path):
-                with open(config_path, 'r', encoding='utf-8') as f:
-                    settings = json.load(f)
-                #合并默认配置
-                def merge_dict(base: dict, override: dict) -> dict:
-                    result = base.copy()
-                    for key, value in override.items():
-                        if key in result and isinstance(result[key], dict) and isinstance(value, dict):
-                            result[key] = merge_dict(result[key], value)
-                        else:
-                            result[key] = value
-                    return result
-                return merge_dict(cls.DEFAULT_SETTINGS, settings)
+            settings = _load_cached(config_path, cls.DEFAULT_SETTINGS)
+            if settings is not None:
+                logger.info(f"配置文件加载成功: {config_path}")
+                return settings
+            logger.info("配置文件不存在，使用默认配置")
+        except json.JSONDecodeError as e:
+            logger.error(f"配置文件JSON格式错误: {e}")
         except Exception as e:
-            logger.error(f"加载配置失败: {e}")
+            logger.error(f"加载配置文件失败: {e}")
 
-        return cls.DEFAULT_SETTINGS.copy()
+        return cls._default_settings()
 
 
 #测试代码
 if __name__ == '__main__':
     import sys
-    logger.remove()
-    logger.add(sys.stdout, level="DEBUG")
+    import logging
+    logging.basicConfig(level=logging.DEBUG, stream=sys.stdout)
 
     root = tk.Tk()
     root.withdraw()
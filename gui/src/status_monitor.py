@@ -11,11 +11,80 @@
 
 import tkinter as tk
 from tkinter import ttk
-from datetime import datetime
-from typing import Optional, Dict, Any, Callable
-from loguru import logger
-
-from error_codes import get_error_message, get_error_category, is_success
+import tkinter.font as tkfont
+import struct
+import time
+from collections import deque
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Optional, Dict, Any, Callable, Mapping, Tuple
+
+from logger import logger
+from error_codes import SUCCESS, ERROR_HEX, get_error_message, get_error_category
+
+
+#参数结构体（0xA1响应，18字节大端）:
+#曝光模式(1) 曝光值(4) 增益(2) 白平衡模式(1) R(2) G(2) B(2) 宽(2) 高(2)
+_PARAMS_STRUCT = struct.Struct('>BIHBHHHHH')
+_PARAMS_FIELDS = ('exposure_mode', 'exposure_value', 'gain', 'wb_mode',
+                  'wb_r', 'wb_g', 'wb_b', 'width', 'height')
+
+#状态字节（0xA0响应）低5位查找表，每种组合预先生成一个只读状态字典
+_STATUS_MASK = 0x1F
+_STATUS_LUT = tuple(
+    MappingProxyType({
+        'camera_connected': bool(i & 0x01),
+        'capturing': bool(i & 0x02),
+        'recording': bool(i & 0x04),
+        'previewing': bool(i & 0x08),
+        'continuous': bool(i & 0x10),
+    })
+    for i in range(_STATUS_MASK + 1)
+)
+
+def _make_dot(master, color: str, size: int = 12) -> tk.PhotoImage:
+    """
+    生成圆点图像（背景透明）
+
+    Args:
+        master: 所属控件
+        color: 填充颜色
+        size: 图像边长（像素），圆点直径为size-2
+
+    Returns:
+        PhotoImage对象
+    """
+    image = tk.PhotoImage(master=master, width=size, height=size)
+    center = (size - 1) / 2
+    radius = (size - 2) / 2
+    for y in range(size):
+        dy = y - center
+        if abs(dy) >= radius:
+            continue
+        half = (radius * radius - dy * dy) ** 0.5
+        x0 = int(round(center - half))
+        x1 = int(round(center + half)) + 1
+        image.put(color, to=(x0, y, x1, y + 1))
+    return image
+
+
+@lru_cache(maxsize=256)
+def _format_error(error_code: int, context: str) -> Tuple[str, bool]:
+    """
+    格式化错误码日志（同一错误码和上下文只格式化一次）
+
+    Returns:
+        (日志文本, 是否成功)
+    """
+    error_msg = get_error_message(error_code)
+    error_cat = get_error_category(error_code)
+    error_hex = ERROR_HEX.get(error_code) or f"0x{error_code:04X}"
+
+    if context:
+        full_msg = f"{context} - [{error_cat}] {error_hex}: {error_msg}"
+    else:
+        full_msg = f"[{error_cat}] {error_hex}: {error_msg}"
+    return full_msg, error_code == SUCCESS
 
 
 class StatusMonitor(ttk.Frame):
@@ -23,6 +92,26 @@ class StatusMonitor(ttk.Frame):
 
     #最大日志条数
     MAX_LOG_ENTRIES = 500
+    #日志刷新到界面的间隔（毫秒）
+    LOG_FLUSH_MS = 100
+
+    #日志标签样式 {标签: 前景色}
+    LOG_TAG_COLORS = {
+        'timestamp': '#666666',
+        'info': '#000000',
+        'success': '#008000',
+        'warning': '#FF8C00',
+        'error': '#FF0000',
+    }
+
+    #状态文字 {状态键: (激活文字, 未激活文字)}
+    STATUS_TEXT = {
+        'camera_connected': ('已连接', '未连接'),
+        'capturing': ('拍照中', '空闲'),
+        'recording': ('录像中', '空闲'),
+        'previewing': ('开启', '关闭'),
+        'continuous': ('连拍中', '空闲'),
+    }
 
     def __init__(self, parent, **kwargs):
         """
@@ -34,13 +123,7 @@ class StatusMonitor(ttk.Frame):
         super().__init__(parent, **kwargs)
 
         #状态数据
-        self._camera_status = {
-            'camera_connected': False,
-            'capturing': False,
-            'recording': False,
-            'previewing': False,
-            'continuous': False,
-        }
+        self._camera_status = dict.fromkeys(self.STATUS_TEXT, False)  #默认状态，最新值见_shown_status
 
         #参数数据
         self._camera_params = {
@@ -55,12 +138,29 @@ class StatusMonitor(ttk.Frame):
             'height': 0,
         }
 
-        #日志计数
-        self._log_count = 0
+        #待显示的日志 (时间戳文本, 'timestamp', 消息文本, 级别)，已格式化为insert参数，
+        #超出上限时最旧的自动丢弃
+        self._pending_logs = deque(maxlen=self.MAX_LOG_ENTRIES)
+        #时间戳缓存 (整秒, 格式化文本)，同一秒内的日志复用
+        self._ts_cache = (0, '')
+        #日志级别 -> 日志文件输出方法
+        self._log_funcs = {
+            'info': logger.info,
+            'success': logger.info,
+            'warning': logger.warning,
+            'error': logger.error,
+        }
+
+        #界面当前显示的状态/参数文字，值未变化时不重复配置控件
+        self._shown_status: Dict[str, bool] = {}
+        self._shown_params: Dict[str, str] = {}
 
         #创建界面
         self._create_ui()
 
+        #定时把待显示日志写入界面
+        self.after(self.LOG_FLUSH_MS, self._flush_log)
+
     def _create_ui(self):
         """创建用户界面"""
         #主布局：左侧状态+参数，右侧日志
@@ -86,9 +186,14 @@ class StatusMonitor(ttk.Frame):
         status_frame = ttk.LabelFrame(parent, text="设备状态", padding="5")
         status_frame.pack(fill=tk.X, pady=(0, 5))
 
+        #状态指示灯图像（灰色-未激活，绿色-激活）
+        self._dot_off = _make_dot(self, 'gray')
+        self._dot_on = _make_dot(self, '#00CC00')
+
         #状态指示器样式
         self._status_labels = {}
         self._status_indicators = {}
+        self._status_bindings = []
 
         status_items = [
             ('camera_connected', '相机连接'),
@@ -105,10 +210,9 @@ class StatusMonitor(ttk.Frame):
             #标签
             ttk.Label(row_frame, text=f"{label_text}:", width=10).pack(side=tk.LEFT)
 
-            #状态指示灯
-            indicator = tk.Canvas(row_frame, width=12, height=12, highlightthickness=0)
+            #状态指示灯（切换预先生成的圆点图像）
+            indicator = ttk.Label(row_frame, image=self._dot_off)
             indicator.pack(side=tk.LEFT, padx=(0, 5))
-            indicator.create_oval(1, 1, 11, 11, fill='gray', outline='', tags='indicator')
             self._status_indicators[key] = indicator
 
             #状态文字
@@ -116,6 +220,10 @@ class StatusMonitor(ttk.Frame):
             status_label.pack(side=tk.LEFT)
             self._status_labels[key] = status_label
 
+            #update_status直接使用的绑定: (状态键, 激活文字, 未激活文字, 指示灯, 文字标签)
+            on_text, off_text = self.STATUS_TEXT[key]
+            self._status_bindings.append((key, on_text, off_text, indicator, status_label))
+
     def _create_params_frame(self, parent):
         """创建参数回显区域"""
         params_frame = ttk.LabelFrame(parent, text="相机参数", padding="5")
@@ -148,13 +256,20 @@ class StatusMonitor(ttk.Frame):
         log_frame.columnconfigure(0, weight=1)
         log_frame.rowconfigure(0, weight=1)
 
-        #日志文本框
+        #日志字体（命名字体属于本窗口的Tk解释器，随实例创建，日志文本和标签共用）
+        self._log_font = tkfont.Font(root=self, family='Consolas', size=9)
+        self._log_font_bold = tkfont.Font(root=self, family='Consolas', size=9, weight='bold')
+
+        #日志文本框（只读追加，关闭撤销记录）
         self._log_text = tk.Text(
             log_frame,
             height=8,
             state=tk.DISABLED,
             wrap=tk.WORD,
-            font=('Consolas', 9)
+            undo=False,
+            maxundo=0,
+            autoseparators=False,
+            font=self._log_font
         )
         self._log_text.grid(row=0, column=0, sticky='nsew')
 
@@ -164,11 +279,9 @@ class StatusMonitor(ttk.Frame):
         self._log_text.config(yscrollcommand=scrollbar.set)
 
         #配置标签样式
-        self._log_text.tag_configure('timestamp', foreground='#666666')
-        self._log_text.tag_configure('info', foreground='#000000')
-        self._log_text.tag_configure('success', foreground='#008000')
-        self._log_text.tag_configure('warning', foreground='#FF8C00')
-        self._log_text.tag_configure('error', foreground='#FF0000', font=('Consolas', 9, 'bold'))
+        for tag, color in self.LOG_TAG_COLORS.items():
+            self._log_text.tag_configure(tag, foreground=color)
+        self._log_text.tag_configure('error', font=self._log_font_bold)
 
         #清空按钮
         btn_frame = ttk.Frame(log_frame)
@@ -176,7 +289,7 @@ class StatusMonitor(ttk.Frame):
 
         ttk.Button(btn_frame, text="清空日志", command=self.clear_log).pack(side=tk.RIGHT)
 
-    def parse_status_byte(self, status: int) -> Dict[str, bool]:
+    def parse_status_byte(self, status: int) -> Mapping[str, bool]:
         """
         解析状态字节（0xA0响应）
 
@@ -184,15 +297,9 @@ class StatusMonitor(ttk.Frame):
             status: 状态字节
 
         Returns:
-            状态字典
+            状态字典（查找表中共享的只读映射）
         """
-        return {
-            'camera_connected': bool(status & 0x01),
-            'capturing': bool(status & 0x02),
-            'recording': bool(status & 0x04),
-            'previewing': bool(status & 0x08),
-            'continuous': bool(status & 0x10),
-        }
+        return _STATUS_LUT[status & _STATUS_MASK]
 
     def parse_params(self, data: bytes) -> Optional[Dict[str, Any]]:
         """
@@ -202,27 +309,14 @@ class StatusMonitor(ttk.Frame):
             data: 18字节参数数据
 
         Returns:
-            参数字典，解析失败返回None
+            参数字典，数据长度不足返回None
         """
-        if len(data) < 18:
-            logger.warning(f"参数数据长度不足: {len(data)} < 18")
+        if len(data) < _PARAMS_STRUCT.size:
+            logger.warning(f"参数数据长度不足: {len(data)} < {_PARAMS_STRUCT.size}")
             return None
 
-        try:
-            return {
-                'exposure_mode': data[0],  #0-自动, 1-手动
-                'exposure_value': int.from_bytes(data[1:5], 'big'),  #微秒
-                'gain': int.from_bytes(data[5:7], 'big'),
-                'wb_mode': data[7],  #0-自动, 1-手动
-                'wb_r': int.from_bytes(data[8:10], 'big'),
-                'wb_g': int.from_bytes(data[10:12], 'big'),
-                'wb_b': int.from_bytes(data[12:14], 'big'),
-                'width': int.from_bytes(data[14:16], 'big'),
-                'height': int.from_bytes(data[16:18], 'big'),
-            }
-        except Exception as e:
-            logger.error(f"参数解析失败: {e}")
-            return None
+        #曝光/白平衡模式: 0-自动, 1-手动；曝光值单位微秒
+        return dict(zip(_PARAMS_FIELDS, _PARAMS_STRUCT.unpack_from(data, 0)))
 
     def update_status(self, status_data: Dict[str, bool]):
         """
@@ -231,26 +325,18 @@ class StatusMonitor(ttk.Frame):
         Args:
             status_data: 状态字典
         """
-        self._camera_status.update(status_data)
-
-        #更新UI
-        status_text_map = {
-            'camera_connected': ('已连接', '未连接'),
-            'capturing': ('拍照中', '空闲'),
-            'recording': ('录像中', '空闲'),
-            'previewing': ('开启', '关闭'),
-            'continuous': ('连拍中', '空闲'),
-        }
-
-        for key, (on_text, off_text) in status_text_map.items():
+        #更新UI（仅更新变化的状态）
+        shown = self._shown_status
+        for key, on_text, off_text, indicator, label in self._status_bindings:
             if key in status_data:
                 is_active = status_data[key]
+                if shown.get(key) == is_active:
+                    continue
+                shown[key] = is_active
                 #更新指示灯颜色
-                color = '#00CC00' if is_active else 'gray'
-                self._status_indicators[key].itemconfig('indicator', fill=color)
+                indicator.config(image=self._dot_on if is_active else self._dot_off)
                 #更新文字
-                text = on_text if is_active else off_text
-                self._status_labels[key].config(text=text)
+                label.config(text=on_text if is_active else off_text)
 
     def update_status_from_byte(self, status_byte: int):
         """
@@ -274,27 +360,29 @@ class StatusMonitor(ttk.Frame):
         #曝光显示
         exposure_mode = '自动' if params_data.get('exposure_mode', 0) == 0 else '手动'
         exposure_value = params_data.get('exposure_value', 0)
-        self._param_labels['exposure'].config(
-            text=f"{exposure_mode} / {exposure_value} us"
-        )
+        self._set_param_text('exposure', f"{exposure_mode} / {exposure_value} us")
 
         #增益显示
         gain = params_data.get('gain', 0)
-        self._param_labels['gain'].config(text=f"{gain}")
+        self._set_param_text('gain', f"{gain}")
 
         #白平衡显示
         wb_mode = '自动' if params_data.get('wb_mode', 0) == 0 else '手动'
         wb_r = params_data.get('wb_r', 0)
         wb_g = params_data.get('wb_g', 0)
         wb_b = params_data.get('wb_b', 0)
-        self._param_labels['white_balance'].config(
-            text=f"{wb_mode} / R:{wb_r} G:{wb_g} B:{wb_b}"
-        )
+        self._set_param_text('white_balance', f"{wb_mode} / R:{wb_r} G:{wb_g} B:{wb_b}")
 
         #分辨率显示
         width = params_data.get('width', 0)
         height = params_data.get('height', 0)
-        self._param_labels['resolution'].config(text=f"{width} x {height}")
+        self._set_param_text('resolution', f"{width} x {height}")
+
+    def _set_param_text(self, key: str, text: str):
+        """设置参数标签文字，与当前显示相同时跳过"""
+        if self._shown_params.get(key) != text:
+            self._shown_params[key] = text
+            self._param_labels[key].config(text=text)
 
     def update_params_from_bytes(self, data: bytes):
         """
@@ -311,38 +399,53 @@ class StatusMonitor(ttk.Frame):
         """
         添加日志记录
 
+        不直接操作Tk控件，可在任意线程调用；文本在调用方格式化，主线程只负责插入
+
         Args:
             message: 日志内容
             level: 日志级别（info/success/warning/error）
         """
-        #获取时间戳
-        timestamp = datetime.now().strftime('%H:%M:%S')
+        #获取时间戳（每秒只格式化一次）
+        now = int(time.time())
+        if now != self._ts_cache[0]:
+            self._ts_cache = (now, time.strftime('%H:%M:%S', time.localtime(now)))
+        timestamp = self._ts_cache[1]
 
-        #启用编辑
-        self._log_text.config(state=tk.NORMAL)
+        #界面由_flush_log定时批量更新
+        self._pending_logs.append((f"[{timestamp}] ", 'timestamp', f"{message}\n", level))
 
-        #检查是否需要清理旧日志
-        self._log_count += 1
-        if self._log_count > self.MAX_LOG_ENTRIES:
-            #删除前100行
-            self._log_text.delete('1.0', '101.0')
-            self._log_count -= 100
+        #同时输出到日志文件
+        self._log_funcs.get(level, logger.info)(message)
 
-        #插入时间戳
-        self._log_text.insert(tk.END, f"[{timestamp}] ", 'timestamp')
+    def _flush_log(self):
+        """把待显示日志写入界面（日志区域不可见时暂存，可见后再写入）"""
+        pending = self._pending_logs
+        if pending and self._log_text.winfo_viewable():
+            #用户向上翻看历史时不自动滚动
+            at_bottom = self._log_text.yview()[1] >= 0.999
 
-        #插入消息
-        self._log_text.insert(tk.END, f"{message}\n", level)
+            #启用编辑
+            self._log_text.config(state=tk.NORMAL)
 
-        #滚动到底部
-        self._log_text.see(tk.END)
+            #所有待显示日志合并为一次insert调用: 文本, 标签, 文本, 标签, ...
+            chunks = []
+            while pending:
+                chunks += pending.popleft()
+            self._log_text.insert(tk.END, *chunks)
 
-        #禁用编辑
-        self._log_text.config(state=tk.DISABLED)
+            #超出上限时淘汰最旧的日志（末尾换行后还有一个空行）
+            excess = int(self._log_text.index('end-1c').split('.')[0]) - 1 - self.MAX_LOG_ENTRIES
+            if excess > 0:
+                self._log_text.delete('1.0', f'{excess + 1}.0')
+
+            #原本位于底部时保持滚动到底部
+            if at_bottom:
+                self._log_text.yview_moveto(1.0)
 
-        #同时输出到loguru
-        log_func = getattr(logger, level if level != 'success' else 'info', logger.info)
-        log_func(message)
+            #禁用编辑
+            self._log_text.config(state=tk.DISABLED)
+
+        self.after(self.LOG_FLUSH_MS, self._flush_log)
 
     def log_info(self, message: str):
         """记录普通信息"""
@@ -368,29 +471,24 @@ class StatusMonitor(ttk.Frame):
             error_code: 错误码
             context: 上下文信息（如命令名称）
         """
-        error_msg = get_error_message(error_code)
-        error_cat = get_error_category(error_code)
-
-        if context:
-            full_msg = f"{context} - [{error_cat}] 0x{error_code:04X}: {error_msg}"
-        else:
-            full_msg = f"[{error_cat}] 0x{error_code:04X}: {error_msg}"
+        full_msg, success = _format_error(error_code, context)
 
-        if is_success(error_code):
+        if success:
             self.log_success(full_msg)
         else:
             self.log_error(full_msg)
 
     def clear_log(self):
         """清空日志"""
+        self._pending_logs.clear()
         self._log_text.config(state=tk.NORMAL)
         self._log_text.delete('1.0', tk.END)
         self._log_text.config(state=tk.DISABLED)
-        self._log_count = 0
 
     def get_status(self) -> Dict[str, bool]:
         """获取当前状态"""
-        return self._camera_status.copy()
+        #最新状态只记录在_shown_status中，查询时再与默认状态合并
+        return {**self._camera_status, **self._shown_status}
 
     def get_params(self) -> Dict[str, Any]:
         """获取当前参数"""
@@ -408,8 +506,8 @@ class StatusMonitor(ttk.Frame):
         })
 
         #重置参数显示
-        for label in self._param_labels.values():
-            label.config(text="--")
+        for key in self._param_labels:
+            self._set_param_text(key, "--")
 
         #重置参数数据
         self._camera_params = {
@@ -428,8 +526,8 @@ class StatusMonitor(ttk.Frame):
 #测试代码
 if __name__ == '__main__':
     import sys
-    logger.remove()
-    logger.add(sys.stdout, level="DEBUG")
+    import logging
+    logging.basicConfig(level=logging.DEBUG, stream=sys.stdout)
 
     #创建测试窗口
     root = tk.Tk()
@@ -19,18 +19,80 @@ TCP客户端模块
 - 粘包/拆包异常处理
 """
 
+import logging
+import queue
+import selectors
 import socket
+import struct
+import sys
 import threading
 import time
-from typing import Callable, Optional, Tuple
-from loguru import logger
+from typing import Callable, List, Optional, Sequence, Tuple
 
+from logger import logger
 from protocol_builder import (
-    FRAME_HEADER, FRAME_FOOTER, PROTOCOL_VERSION,
+    FRAME_HEADER, FRAME_FOOTER, PROTOCOL_VERSION, MAX_DATA_LENGTH,
     parse_frame, build_heartbeat, Command
 )
 
 
+#非阻塞接收标志（发送线程共用同一socket，不能把socket整体设为非阻塞；
+#Windows无此标志，select就绪后recv同样不会阻塞）
+_RECV_FLAGS = getattr(socket, 'MSG_DONTWAIT', 0)
+
+#帧长度字段（4字节大端序）
+_LEN_STRUCT = struct.Struct('>I')
+#帧尾按整数比较，避免每帧切片
+_U16_STRUCT = struct.Struct('>H')
+_FRAME_FOOTER_U16 = _U16_STRUCT.unpack(FRAME_FOOTER)[0]
+
+def _pack_timeout(seconds: float) -> bytes:
+    """
+    打包SO_SNDTIMEO/SO_RCVTIMEO选项值
+
+    Windows为DWORD毫秒数，POSIX为struct timeval（秒+微秒，均为long）
+
+    Args:
+        seconds: 超时时间（秒）
+
+    Returns:
+        setsockopt使用的选项值
+    """
+    if sys.platform == 'win32':
+        return struct.pack('@I', int(seconds * 1000))
+    sec = int(seconds)
+    return struct.pack('@ll', sec, int((seconds - sec) * 1_000_000))
+
+
+def _sendmsg_all(sock: socket.socket, buffers: List[bytes]):
+    """
+    使用sendmsg聚集发送全部缓冲区（处理部分发送）
+
+    Args:
+        sock: 目标socket
+        buffers: 待发送的缓冲区列表，内核直接从各缓冲区读取，无需拼接
+    """
+    views = [memoryview(b) for b in buffers]
+    while views:
+        sent = sock.sendmsg(views)
+        while sent:
+            n = views[0].nbytes
+            if sent >= n:
+                sent -= n
+                views.pop(0)
+            else:
+                views[0] = views[0][sent:]
+                sent = 0
+
+
+#Windows无sendmsg，退回拼接后sendall
+_SENDMSG_AVAILABLE = hasattr(socket.socket, 'sendmsg')
+
+
+#预构建的心跳帧（内容固定，每次心跳直接复用）
+_FRAME_HEARTBEAT = build_heartbeat()
+
+
 class ConnectionState:
     """连接状态枚举"""
     DISCONNECTED = 0  #未连接
@@ -46,16 +108,35 @@ class TcpClient:
     DEFAULT_RECONNECT_INTERVAL = 5.0  #默认重连间隔（秒）
     DEFAULT_RECONNECT_MAX_ATTEMPTS = 10  #默认最大重连次数
     DEFAULT_HEARTBEAT_INTERVAL = 5.0  #默认心跳间隔（秒）
-    DEFAULT_RECV_TIMEOUT = 1.0  #默认接收超时（秒）
+    DEFAULT_RECV_TIMEOUT = 1.0  #默认接收等待超时（秒），用于检查运行标志
     DEFAULT_SEND_TIMEOUT = 5.0  #默认发送超时（秒）
+    RECV_CHUNK_SIZE = 64 * 1024  #单次接收最大字节数
+    RECV_BUFFER_INITIAL = 1024 * 1024  #接收缓冲区初始容量（字节）
+    SEND_BATCH_SIZE = 64 * 1024  #发送线程单次合并的最大字节数
+    SEND_BATCH_PARTS = 64  #发送线程单次合并的最大缓冲区数（低于系统IOV_MAX）
+    LOG_PREVIEW_BYTES = 16  #日志中打印的无效数据字节数上限
+    SOCKET_BUFFER_SIZE = 4 * 1024 * 1024  #内核收发缓冲区大小（字节），容纳大预览帧
+    KEEPALIVE_IDLE = 10  #TCP保活：空闲多久开始探测（秒）
+    KEEPALIVE_INTERVAL = 5  #TCP保活：探测间隔（秒）
+    KEEPALIVE_COUNT = 3  #TCP保活：探测失败次数
 
     def __init__(self):
         self._socket: Optional[socket.socket] = None
         self._state = ConnectionState.DISCONNECTED
         self._recv_thread: Optional[threading.Thread] = None
-        self._heartbeat_thread: Optional[threading.Thread] = None
+        self._send_thread: Optional[threading.Thread] = None
         self._running = False
+
+        #发送队列（由发送线程写入socket，None为退出标记）
+        self._send_q: queue.SimpleQueue = queue.SimpleQueue()
+        #接收线程唤醒socket（写入任意字节使select立即返回）
+        self._wakeup_send: Optional[socket.socket] = None
+        #重连停止事件（关闭自动重连时唤醒重连等待）
+        self._reconnect_stop = threading.Event()
+        #接收缓冲区：长度即容量，有效数据为[_recv_head, _recv_tail)
         self._recv_buffer = bytearray()
+        self._recv_head = 0  #接收缓冲区已消费位置
+        self._recv_tail = 0  #接收缓冲区已写入位置
 
         #回调函数
         self._on_state_changed: Optional[Callable[[int], None]] = None
@@ -64,6 +145,7 @@ class TcpClient:
         self._on_reconnect_failed: Optional[Callable[[], None]] = None  #重连失败回调
 
         #配置
+        self._heartbeat_enabled = True
         self._heartbeat_interval = self.DEFAULT_HEARTBEAT_INTERVAL
         self._recv_timeout = self.DEFAULT_RECV_TIMEOUT
         self._send_timeout = self.DEFAULT_SEND_TIMEOUT
@@ -76,9 +158,6 @@ class TcpClient:
         self._host = ""
         self._port = 0
 
-        #线程锁
-        self._lock = threading.Lock()
-
         #统计信息
         self._bytes_sent = 0
         self._bytes_received = 0
@@ -86,6 +165,7 @@ class TcpClient:
         self._frames_received = 0
         self._last_heartbeat_time = 0.0
         self._heartbeat_timeout_count = 0  #心跳超时计数
+        self._resync_bytes = 0  #重新同步帧头时丢弃的字节数
 
     @property
     def state(self) -> int:
@@ -122,6 +202,17 @@ class TcpClient:
         """设置心跳间隔（秒）"""
         self._heartbeat_interval = max(1.0, interval)
 
+    def set_heartbeat_enabled(self, enabled: bool):
+        """
+        设置是否发送应用层心跳（下次连接生效）
+
+        连接已启用TCP保活，关闭心跳后由内核检测断线
+
+        Args:
+            enabled: 是否启用
+        """
+        self._heartbeat_enabled = enabled
+
     def set_reconnect(self, enabled: bool, interval: float = 5.0, max_attempts: int = 10):
         """
         设置自动重连
@@ -133,6 +224,10 @@ class TcpClient:
         """
         self._reconnect_enabled = enabled
         self._reconnect_interval = max(1.0, interval)
+        if enabled:
+            self._reconnect_stop.clear()
+        else:
+            self._reconnect_stop.set()
         self._reconnect_max_attempts = max(0, max_attempts)
 
     def get_statistics(self) -> dict:
@@ -149,6 +244,7 @@ class TcpClient:
             "frames_received": self._frames_received,
             "reconnect_attempts": self._reconnect_attempts,
             "heartbeat_timeout_count": self._heartbeat_timeout_count,
+            "resync_bytes": self._resync_bytes,
         }
 
     def connect(self, host: str, port: int, timeout: float = 5.0) -> bool:
@@ -185,19 +281,28 @@ class TcpClient:
 
         try:
             self._socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            self._configure_socket(self._socket)
             self._socket.settimeout(timeout)
             self._socket.connect((self._host, port))
-            self._socket.settimeout(self._recv_timeout)
+            #接收由selector等待就绪，socket本身使用阻塞模式
+            self._socket.settimeout(None)
 
             #禁用Nagle算法，减少延迟
             self._socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            #立即确认（仅Linux）
+            if hasattr(socket, 'TCP_QUICKACK'):
+                self._socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_QUICKACK, 1)
 
             #设置发送超时
             self._socket.setsockopt(socket.SOL_SOCKET, socket.SO_SNDTIMEO,
-                                    int(self._send_timeout * 1000).to_bytes(8, 'little'))
+                                    _pack_timeout(self._send_timeout))
 
             self._running = True
-            self._recv_buffer.clear()
+            #预分配接收缓冲区；已扩容的缓冲区跨重连保留，按最大帧保持容量
+            if len(self._recv_buffer) < self.RECV_BUFFER_INITIAL:
+                self._recv_buffer = bytearray(self.RECV_BUFFER_INITIAL)
+            self._recv_head = 0
+            self._recv_tail = 0
 
             #重置统计
             self._bytes_sent = 0
@@ -205,15 +310,22 @@ class TcpClient:
             self._frames_sent = 0
             self._frames_received = 0
             self._heartbeat_timeout_count = 0
-
-            #启动接收线程
-            self._recv_thread = threading.Thread(target=self._recv_loop, daemon=True)
+            self._resync_bytes = 0
+
+            #启动发送线程（每次连接使用新队列，旧队列中的残留数据随旧线程丢弃）
+            self._send_q = queue.SimpleQueue()
+            self._send_thread = threading.Thread(
+                target=self._send_loop, args=(self._socket, self._send_q), daemon=True
+            )
+            self._send_thread.start()
+
+            #启动接收线程（同时按截止时间发送心跳）
+            wakeup_recv, self._wakeup_send = socket.socketpair()
+            self._recv_thread = threading.Thread(
+                target=self._recv_loop, args=(self._socket, wakeup_recv), daemon=True
+            )
             self._recv_thread.start()
 
-            #启动心跳线程
-            self._heartbeat_thread = threading.Thread(target=self._heartbeat_loop, daemon=True)
-            self._heartbeat_thread.start()
-
             self._set_state(ConnectionState.CONNECTED)
             logger.info(f"连接成功: {self._host}:{port}")
             return True
@@ -261,6 +373,9 @@ class TcpClient:
         logger.info("断开连接")
         self._running = False
         self._reconnect_enabled = False  #禁用自动重连
+        self._reconnect_stop.set()
+        self._send_q.put(None)
+        self._wakeup_recv_loop()
 
         #关闭socket
         if self._socket:
@@ -279,12 +394,13 @@ class TcpClient:
         #等待线程结束
         if self._recv_thread and self._recv_thread.is_alive():
             self._recv_thread.join(timeout=2.0)
-        if self._heartbeat_thread and self._heartbeat_thread.is_alive():
-            self._heartbeat_thread.join(timeout=2.0)
+        if self._send_thread and self._send_thread.is_alive():
+            self._send_thread.join(timeout=2.0)
 
         self._recv_thread = None
-        self._heartbeat_thread = None
-        self._recv_buffer.clear()
+        self._send_thread = None
+        self._recv_head = 0
+        self._recv_tail = 0
 
         self._set_state(ConnectionState.DISCONNECTED)
 
@@ -292,57 +408,68 @@ class TcpClient:
         """
         发送数据
 
+        数据加入发送队列后立即返回，由发送线程写入socket，
+        发送失败时由发送线程处理断线
+
         Args:
             data: 要发送的数据
 
         Returns:
-            是否发送成功
+            是否已加入发送队列
+        """
+        return self.send_parts((data,))
+
+    def send_parts(self, parts: Sequence[bytes]) -> bool:
+        """
+        分段发送数据
+
+        各段按顺序作为一个整体发送，支持时由sendmsg聚集发送，调用方无需拼接
+
+        Args:
+            parts: 数据段序列
+
+        Returns:
+            是否已加入发送队列
         """
         if not self.is_connected:
             logger.warning("未连接，无法发送数据")
             return False
 
-        with self._lock:
-            try:
-                self._socket.sendall(data)
-                self._bytes_sent += len(data)
-                self._frames_sent += 1
-                logger.debug(f"发送数据: {data.hex().upper()}")
-                return True
-            except socket.timeout:
-                error_msg = "发送超时"
-                logger.error(error_msg)
-                self._handle_error(error_msg)
-                self._handle_disconnect()
-                return False
-            except BrokenPipeError:
-                error_msg = "连接已断开（管道破裂）"
-                logger.error(error_msg)
-                self._handle_error(error_msg)
-                self._handle_disconnect()
-                return False
-            except ConnectionResetError:
-                error_msg = "连接被重置"
-                logger.error(error_msg)
-                self._handle_error(error_msg)
-                self._handle_disconnect()
-                return False
-            except socket.error as e:
-                error_msg = f"发送失败: {e}"
-                logger.error(error_msg)
-                self._handle_error(error_msg)
-                self._handle_disconnect()
-                return False
-            except Exception as e:
-                error_msg = f"发送异常: {e}"
-                logger.error(error_msg)
-                self._handle_error(error_msg)
-                self._handle_disconnect()
-                return False
+        self._send_q.put(tuple(parts))
+        return True
 
     def send_heartbeat(self) -> bool:
         """发送心跳"""
-        return self.send(build_heartbeat())
+        return self.send(_FRAME_HEARTBEAT)
+
+    def _configure_socket(self, sock: socket.socket):
+        """
+        设置socket选项（连接前调用）
+
+        增大收发缓冲区减少大帧传输时的窗口等待，
+        启用TCP保活由内核检测死连接
+
+        Args:
+            sock: 待连接的socket
+        """
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, self.SOCKET_BUFFER_SIZE)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, self.SOCKET_BUFFER_SIZE)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+
+        #保活参数调整失败不影响连接，使用系统默认参数
+        try:
+            if hasattr(socket, 'TCP_KEEPIDLE'):
+                #Linux（Windows 10 1709+的Python 3.7+同样提供）
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, self.KEEPALIVE_IDLE)
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPINTVL, self.KEEPALIVE_INTERVAL)
+                if hasattr(socket, 'TCP_KEEPCNT'):
+                    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPCNT, self.KEEPALIVE_COUNT)
+            elif hasattr(socket, 'SIO_KEEPALIVE_VALS'):
+                #旧版Windows：(开关, 空闲毫秒, 间隔毫秒)
+                sock.ioctl(socket.SIO_KEEPALIVE_VALS,
+                           (1, self.KEEPALIVE_IDLE * 1000, self.KEEPALIVE_INTERVAL * 1000))
+        except OSError as e:
+            logger.debug(f"设置TCP保活参数失败，使用系统默认值: {e}")
 
     def _set_state(self, state: int):
         """设置连接状态"""
@@ -379,6 +506,8 @@ class TcpClient:
     def _cleanup(self):
         """清理资源"""
         self._running = False
+        self._send_q.put(None)
+        self._wakeup_recv_loop()
         if self._socket:
             try:
                 self._socket.close()
@@ -387,28 +516,138 @@ class TcpClient:
             self._socket = None
         self._set_state(ConnectionState.DISCONNECTED)
 
-    def _recv_loop(self):
-        """接收数据循环"""
+    def _send_loop(self, sock: socket.socket, send_q: queue.SimpleQueue):
+        """
+        发送数据循环
+
+        合并队列中已排队的小帧后一次写入，减少系统调用次数；
+        支持sendmsg时直接聚集发送各缓冲区，不拼接
+
+        Args:
+            sock: 本次连接的socket
+            send_q: 本次连接的发送队列
+        """
+        logger.debug("发送线程启动")
+        stop = False
+
+        while not stop:
+            parts = send_q.get()
+            if parts is None:
+                break
+
+            #合并已排队的数据
+            buffers = list(parts)
+            frames = 1
+            size = sum(map(len, parts))
+            while size < self.SEND_BATCH_SIZE and len(buffers) < self.SEND_BATCH_PARTS:
+                try:
+                    parts = send_q.get_nowait()
+                except queue.Empty:
+                    break
+                if parts is None:
+                    stop = True
+                    break
+                buffers.extend(parts)
+                frames += 1
+                size += sum(map(len, parts))
+
+            error_msg = None
+            try:
+                if len(buffers) == 1:
+                    sock.sendall(buffers[0])
+                elif _SENDMSG_AVAILABLE:
+                    _sendmsg_all(sock, buffers)
+                else:
+                    sock.sendall(b''.join(buffers))
+            except socket.timeout:
+                error_msg = "发送超时"
+            except BrokenPipeError:
+                error_msg = "连接已断开（管道破裂）"
+            except ConnectionResetError:
+                error_msg = "连接被重置"
+            except socket.error as e:
+                error_msg = f"发送失败: {e}"
+            except Exception as e:
+                error_msg = f"发送异常: {e}"
+
+            if error_msg is None:
+                self._bytes_sent += size
+                self._frames_sent += frames
+                #hex格式化开销随帧长增长，仅在DEBUG级别开启时执行
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(f"发送数据: {b''.join(buffers).hex().upper()}")
+                continue
+
+            #主动断开时socket已关闭，不作为错误处理
+            if self._running:
+                logger.error(error_msg)
+                self._handle_error(error_msg)
+                self._handle_disconnect()
+            break
+
+        logger.debug("发送线程退出")
+
+    def _wakeup_recv_loop(self):
+        """唤醒接收线程的select等待"""
+        wakeup = self._wakeup_send
+        self._wakeup_send = None
+        if wakeup:
+            try:
+                wakeup.send(b'\x00')
+            except OSError:
+                pass
+            wakeup.close()
+
+    def _recv_loop(self, sock: socket.socket, wakeup: socket.socket):
+        """
+        接收数据循环
+
+        通过selector等待socket可读，不依赖接收超时异常轮询；
+        等待超时取到下次心跳截止时间，心跳不再单独占用线程
+
+        Args:
+            sock: 本次连接的socket
+            wakeup: 唤醒socket，可读时表示连接已停止
+        """
         logger.debug("接收线程启动")
-        consecutive_errors = 0  #连续错误计数
-        max_consecutive_errors = 5  #最大连续错误次数
+
+        selector = selectors.DefaultSelector()
+        selector.register(sock, selectors.EVENT_READ)
+        selector.register(wakeup, selectors.EVENT_READ)
+
+        heartbeat_due = time.monotonic() + self._heartbeat_interval if self._heartbeat_enabled else None
 
         while self._running:
             try:
-                data = self._socket.recv(4096)
-                if not data:
+                timeout = self._recv_timeout
+                if heartbeat_due is not None:
+                    now = time.monotonic()
+                    if now >= heartbeat_due:
+                        self._heartbeat()
+                        heartbeat_due = now + self._heartbeat_interval
+                    timeout = min(timeout, heartbeat_due - now)
+
+                events = selector.select(timeout=timeout)
+                if not events:
+                    continue
+                if any(key.fileobj is wakeup for key, _ in events):
+                    break
+
+                #直接接收到缓冲区尾部，不经过中间bytes对象
+                with self._recv_view() as view:
+                    n = sock.recv_into(view, 0, _RECV_FLAGS)
+                if not n:
                     #连接关闭
                     logger.warning("服务器关闭连接")
                     self._handle_disconnect()
                     break
 
-                consecutive_errors = 0  #重置错误计数
-                self._bytes_received += len(data)
-                self._recv_buffer.extend(data)
+                self._bytes_received += n
+                self._recv_tail += n
                 self._process_buffer()
 
-            except socket.timeout:
-                #接收超时，继续循环
+            except BlockingIOError:
+                #就绪通知后数据已被取走（虚假唤醒），继续等待
                 continue
 
             except ConnectionResetError:
@@ -426,16 +665,12 @@ class TcpClient:
                 break
 
             except socket.error as e:
+                #不再有超时异常，其余socket错误均视为连接失效
                 if self._running:
-                    consecutive_errors += 1
                     logger.error(f"接收错误: {e}")
-                    if consecutive_errors >= max_consecutive_errors:
-                        logger.error(f"连续接收错误达到{max_consecutive_errors}次，断开连接")
-                        self._handle_error(f"连续接收错误: {e}")
-                        self._handle_disconnect()
-                        break
-                else:
-                    break
+                    self._handle_error(f"接收错误: {e}")
+                    self._handle_disconnect()
+                break
 
             except Exception as e:
                 if self._running:
@@ -444,51 +679,96 @@ class TcpClient:
                     self._handle_disconnect()
                 break
 
+        selector.close()
+        wakeup.close()
         logger.debug("接收线程退出")
 
+    def _recv_view(self) -> memoryview:
+        """
+        获取接收缓冲区尾部的可写区域
+
+        空间不足时，已消费数据过半则把未消费数据移到开头，否则按倍数扩容；
+        缓冲区容量在连接期间保持不变，只移动读写位置
+
+        Returns:
+            可写区域的memoryview（调用方用完需释放）
+        """
+        buf = self._recv_buffer
+        chunk = self.RECV_CHUNK_SIZE
+        if len(buf) - self._recv_tail < chunk:
+            head = self._recv_head
+            tail = self._recv_tail
+            if head and head * 2 >= tail:
+                pending = tail - head
+                with memoryview(buf) as mv:
+                    mv[:pending] = mv[head:tail]
+                self._recv_head = 0
+                self._recv_tail = pending
+            if len(buf) - self._recv_tail < chunk:
+                buf.extend(bytes(max(len(buf), chunk)))
+        tail = self._recv_tail
+        return memoryview(buf)[tail:tail + chunk]
+
     def _process_buffer(self):
         """
         处理接收缓冲区，解析完整帧
 
         处理粘包/拆包问题，验证帧格式
+        已解析的数据只推进消费位置，不搬移剩余数据
         """
+        buf = self._recv_buffer
+        end = self._recv_tail
+
+        #循环内常用的全局常量和方法绑定为局部变量
+        find = buf.find
+        header = FRAME_HEADER
+        footer = _FRAME_FOOTER_U16
+        unpack_len = _LEN_STRUCT.unpack_from
+        unpack_u16 = _U16_STRUCT.unpack_from
+
         #防止缓冲区过大（可能是协议错误导致）
         max_buffer_size = 10 * 1024 * 1024  #10MB（支持大预览帧）
-        if len(self._recv_buffer) > max_buffer_size:
-            logger.warning(f"接收缓冲区过大({len(self._recv_buffer)}字节)，清空缓冲区")
-            self._recv_buffer.clear()
+        if end - self._recv_head > max_buffer_size:
+            logger.warning(f"接收缓冲区过大({end - self._recv_head}字节)，清空缓冲区")
+            self._recv_head = self._recv_tail = 0
             self._handle_error("接收缓冲区溢出，可能存在协议错误")
             return
 
         while True:
-            #查找帧头
-            header_index = self._recv_buffer.find(FRAME_HEADER)
+            head = self._recv_head
+
+            #查找帧头（跳过已消费数据）
+            header_index = find(header, head, end)
             if header_index == -1:
                 #没有帧头，清空缓冲区
-                if len(self._recv_buffer) > 0:
-                    logger.debug(f"丢弃无效数据: {len(self._recv_buffer)}字节")
-                self._recv_buffer.clear()
+                if end > head:
+                    self._resync_bytes += end - head
+                    logger.debug(f"丢弃无效数据: {end - head}字节")
+                self._recv_head = self._recv_tail = 0
                 break
 
             #丢弃帧头之前的数据
-            if header_index > 0:
-                logger.warning(f"丢弃无效数据: {self._recv_buffer[:header_index].hex().upper()}")
-                del self._recv_buffer[:header_index]
+            #只打印前几个字节，避免失步时格式化大量数据
+            if header_index > head:
+                skipped = header_index - head
+                self._resync_bytes += skipped
+                preview = buf[head:head + min(skipped, self.LOG_PREVIEW_BYTES)].hex()
+                logger.warning(f"丢弃无效数据: {skipped}字节 (前{self.LOG_PREVIEW_BYTES}字节: {preview})")
+                head = self._recv_head = header_index
 
             #检查是否有足够数据解析长度字段
             #帧头(2)+版本(1)+长度(4) = 7
-            if len(self._recv_buffer) < 7:
+            available = end - head
+            if available < 7:
                 break
 
             #解析长度（大端序，4字节）
-            length = (self._recv_buffer[3] << 24) | (self._recv_buffer[4] << 16) | \
-                     (self._recv_buffer[5] << 8) | self._recv_buffer[6]
+            length = unpack_len(buf, head + 3)[0]
 
             #检查长度是否合理
-            max_data_length = 10 * 1024 * 1024  #最大数据长度10MB
-            if length > max_data_length:
+            if length > MAX_DATA_LENGTH:
                 logger.warning(f"数据长度异常: {length}，丢弃帧头")
-                del self._recv_buffer[:2]
+                self._recv_head = head + 2
                 continue
 
             #计算完整帧长度
@@ -496,26 +776,35 @@ class TcpClient:
             frame_length = 2 + 1 + 4 + length + 1 + 2
 
             #检查是否有完整帧
-            if len(self._recv_buffer) < frame_length:
+            if available < frame_length:
                 break
 
             #检查帧尾
-            if self._recv_buffer[frame_length-2:frame_length] != FRAME_FOOTER:
+            frame_end = head + frame_length
+            if unpack_u16(buf, frame_end - 2)[0] != footer:
                 #帧尾不匹配，丢弃帧头，继续查找
                 logger.warning("帧尾不匹配，丢弃帧头")
-                del self._recv_buffer[:2]
+                self._recv_head = head + 2
                 continue
 
-            #提取完整帧
-            frame = bytes(self._recv_buffer[:frame_length])
-            del self._recv_buffer[:frame_length]
+            #在memoryview上直接解析，只复制数据段
+            #memoryview需在回调和缓冲区调整大小前释放
+            bad_frame = None
+            with memoryview(buf) as mv:
+                frame = mv[head:frame_end]
+                result = parse_frame(frame)
+                if not result:
+                    bad_frame = frame[:self.LOG_PREVIEW_BYTES].hex()
+                frame.release()
+
+            self._recv_head = frame_end
 
             #解析帧
-            result = parse_frame(frame)
             if result:
                 version, cmd, data = result
                 self._frames_received += 1
-                logger.debug(f"收到帧: version=0x{version:02X}, cmd=0x{cmd:02X}, data_len={len(data)}")
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(f"收到帧: version=0x{version:02X}, cmd=0x{cmd:02X}, data_len={len(data)}")
 
                 #调用回调
                 if self._on_data_received:
@@ -524,20 +813,16 @@ class TcpClient:
                     except Exception as e:
                         logger.error(f"数据回调异常: {e}")
             else:
-                logger.warning(f"帧解析失败（XOR校验错误）: {frame.hex().upper()}")
+                logger.warning(f"帧解析失败（XOR校验错误）: {frame_length}字节 (前{self.LOG_PREVIEW_BYTES}字节: {bad_frame})")
                 self._handle_error("收到校验错误的数据帧")
 
-    def _heartbeat_loop(self):
-        """心跳发送循环"""
-        logger.debug("心跳线程启动")
-        while self._running:
-            time.sleep(self._heartbeat_interval)
-            if self._running and self.is_connected:
-                self._last_heartbeat_time = time.time()
-                if not self.send_heartbeat():
-                    self._heartbeat_timeout_count += 1
-                    logger.warning(f"心跳发送失败 (第{self._heartbeat_timeout_count}次)")
-        logger.debug("心跳线程退出")
+    def _heartbeat(self):
+        """发送一次心跳（由接收线程在心跳截止时间到达时调用）"""
+        if self._running and self.is_connected:
+            self._last_heartbeat_time = time.time()
+            if not self.send_heartbeat():
+                self._heartbeat_timeout_count += 1
+                logger.warning(f"心跳发送失败 (第{self._heartbeat_timeout_count}次)")
 
     def _reconnect_loop(self):
         """
@@ -546,7 +831,8 @@ class TcpClient:
         实现带最大重试次数的自动重连机制
         """
         logger.info(f"将在{self._reconnect_interval}秒后尝试重连")
-        time.sleep(self._reconnect_interval)
+        if self._reconnect_stop.wait(self._reconnect_interval):
+            return
 
         while self._reconnect_enabled and self._state == ConnectionState.DISCONNECTED:
             #检查重连次数
@@ -571,14 +857,15 @@ class TcpClient:
             else:
                 logger.warning(f"重连失败，{self._reconnect_interval}秒后重试")
                 self._set_state(ConnectionState.DISCONNECTED)
-                time.sleep(self._reconnect_interval)
+                if self._reconnect_stop.wait(self._reconnect_interval):
+                    break
 
 
 if __name__ == '__main__':
     #测试代码
     import sys
-    logger.remove()
-    logger.add(sys.stdout, level="DEBUG")
+    import logging
+    logging.basicConfig(level=logging.DEBUG, stream=sys.stdout)
 
     def on_state_changed(state):
         states = {0: "未连接", 1: "连接中", 2: "已连接"}